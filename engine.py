@@ -15,6 +15,9 @@ import sys
 import os
 import nukescripts
 import logging
+import functools
+import time
+from collections import OrderedDict
 
 
 class NukeEngine(sgtk.platform.Engine):
@@ -97,6 +100,27 @@ class NukeEngine(sgtk.platform.Engine):
         self._processed_paths = []
         self._processed_environments = []
         self._previous_generators = []
+        self._startup_profiler = None
+        self._gizmo_path_registry = None
+        self._applied_favourites = None
+        self._legacy_favourites_removed = False
+        self._favourite_template_paths = {}
+        self._deferred_app_inits = OrderedDict()
+        self._deferred_app_init_scheduled = False
+        self._startup_command_scheduler = None
+        self._serialized_context = None
+        self._command_index = None
+        self._command_index_size = None
+        self._capabilities = None
+        self._context_switch_start = None
+        self._context_switch_latencies = []
+        self._startup_deadline = None
+        self._pending_startup_phases = OrderedDict()
+        self._deferred_startup_phases = []
+        self._log_forwarder = None
+        self._log_dispatch = None
+        self._hiero_debug_level_set = False
+        self._log_ring_buffer = None
 
         super(NukeEngine, self).__init__(*args, **kwargs)
 
@@ -135,6 +159,35 @@ class NukeEngine(sgtk.platform.Engine):
     def menu_generator(self):
         return self._menu_generator
 
+    @property
+    def capabilities(self):
+        """
+        The features of the running version of Nuke. See
+        :class:`tk_nuke.NukeCapabilities`.
+        """
+        # Nuke's version doesn't change while it runs, so this is only computed once.
+        if self._capabilities is None:
+            import tk_nuke
+
+            self._capabilities = tk_nuke.NukeCapabilities.from_env(nuke.env)
+        return self._capabilities
+
+    @property
+    def command_index(self):
+        """
+        Index of the registered commands by app instance. See
+        :class:`tk_nuke.CommandIndex`.
+        """
+        # Commands and apps are cleared and registered again on context changes,
+        # so the size is checked as well in case a change wasn't seen.
+        size = (len(self.commands), len(self.apps))
+        if self._command_index is None or self._command_index_size != size:
+            import tk_nuke
+
+            self._command_index = tk_nuke.CommandIndex(self.commands, self.apps)
+            self._command_index_size = size
+        return self._command_index
+
     @property
     def in_plugin_mode(self):
         """
@@ -155,77 +208,112 @@ class NukeEngine(sgtk.platform.Engine):
 
         import tk_nuke
 
-        tk_nuke.tank_ensure_callbacks_registered(engine=self)
-
-        # We need to check to make sure that we are using one of the
-        # supported versions of Nuke. Right now that is anything between
-        # 6.3v5 and 9.0v*. For versions higher than what we know we
-        # support we'll simply warn and continue. For older versions
-        # we will have to bail out, as we know they won't work properly.
-        nuke_version = (
-            nuke.env.get("NukeVersionMajor"),
-            nuke.env.get("NukeVersionMinor"),
-            nuke.env.get("NukeVersionRelease"),
+        # Keep the most recent log records around for post-mortems. The buffer
+        # listens to Toolkit's root logger rather than being fed by the engine's
+        # handler, so that it also gets records below the level being displayed.
+        ring_buffer_size = self.get_setting("log_ring_buffer_size", 1000)
+        if ring_buffer_size > 0:
+            self._log_ring_buffer = tk_nuke.LogRingBuffer(ring_buffer_size)
+            sgtk.LogManager().root_logger.addHandler(self._log_ring_buffer)
+
+        # Time the startup phases when asked to. Profiling can also be turned on
+        # without changing the configuration through an environment variable.
+        self._startup_profiler = tk_nuke.StartupProfiler(
+            enabled=self.get_setting("startup_profiling", False)
+            or bool(os.environ.get("TK_NUKE_STARTUP_PROFILING"))
         )
 
-        msg = "Nuke 7.0v10 is the minimum version supported!"
-        if nuke_version[0] < 7:
-            self.logger.error(msg)
-            return
-        elif nuke_version[0] == 7 and nuke_version[1] == 0 and nuke_version[2] < 10:
-            self.logger.error(msg)
-            return
-
-        # Versions > 13.1 have not yet been tested so show a message to that effect.
-        if nuke_version[0] > 13 or (nuke_version[0] == 13 and nuke_version[1] > 1):
-            # This is an untested version of Nuke.
-            msg = (
-                "The SG Pipeline Toolkit has not yet been fully tested with Nuke %d.%dv%d. "
-                "You can continue to use the Toolkit but you may experience bugs or "
-                "instability.  Please report any issues to our support team via %s"
-                % (nuke_version[0], nuke_version[1], nuke_version[2], sgtk.support_url)
+        # With a UI, log messages are printed to the Script Editor in batches
+        # rather than one main thread round trip per message.
+        if self.has_ui:
+            self._log_forwarder = tk_nuke.LogForwarder(
+                self, max_rate=self.get_setting("log_forwarding_max_rate", 0)
             )
 
-            # Show nuke message if in UI mode, this is the first time the engine has been started
-            # and the warning dialog isn't overridden by the config. Note that nuke.message isn't
-            # available in Hiero, so we have to skip this there.
-            if (
-                self.has_ui
-                and "TANK_NUKE_ENGINE_INIT_NAME" not in os.environ
-                and nuke_version[0]
-                >= self.get_setting("compatibility_dialog_min_version", 11)
-                and not self.hiero_enabled
-            ):
-                nuke.message("Warning - SG Pipeline Toolkit!\n\n%s" % msg)
-
-            # Log the warning.
-            self.logger.warning(msg)
-
-        # Make sure we are not running Nuke PLE or Non-Commercial!
-        if nuke.env.get("ple"):
-            self.logger.error("The Nuke Engine does not work with Nuke PLE!")
-            return
-        elif nuke.env.get("nc"):
-            self.logger.error("The Nuke Engine does not work with Nuke Non-Commercial!")
-            return
+        # Once this deadline has passed, the non-critical startup phases are
+        # postponed until Nuke is idle.
+        startup_time_budget = self.get_setting("startup_time_budget", 0.0)
+        if startup_time_budget:
+            self._startup_deadline = time.time() + startup_time_budget
+
+        with self._startup_profiler.phase("pre_app_init"):
+            tk_nuke.tank_ensure_callbacks_registered(engine=self)
+
+            with self._startup_profiler.phase("version_checks"):
+                # We need to check to make sure that we are using one of the
+                # supported versions of Nuke. Right now that is anything between
+                # 6.3v5 and 9.0v*. For versions higher than what we know we
+                # support we'll simply warn and continue. For older versions
+                # we will have to bail out, as we know they won't work properly.
+                capabilities = self.capabilities
+                nuke_version = capabilities.version
+
+                msg = "Nuke 7.0v10 is the minimum version supported!"
+                if not capabilities.is_supported_version:
+                    self.logger.error(msg)
+                    return
+
+                # Versions > 13.1 have not yet been tested so show a message to that effect.
+                if not capabilities.is_tested_version:
+                    # This is an untested version of Nuke.
+                    msg = (
+                        "The SG Pipeline Toolkit has not yet been fully tested with Nuke %d.%dv%d. "
+                        "You can continue to use the Toolkit but you may experience bugs or "
+                        "instability.  Please report any issues to our support team via %s"
+                        % (
+                            nuke_version[0],
+                            nuke_version[1],
+                            nuke_version[2],
+                            sgtk.support_url,
+                        )
+                    )
+
+                    # Show nuke message if in UI mode, this is the first time the engine has been started
+                    # and the warning dialog isn't overridden by the config. Note that nuke.message isn't
+                    # available in Hiero, so we have to skip this there.
+                    if (
+                        self.has_ui
+                        and "TANK_NUKE_ENGINE_INIT_NAME" not in os.environ
+                        and nuke_version[0]
+                        >= self.get_setting("compatibility_dialog_min_version", 11)
+                        and not self.hiero_enabled
+                    ):
+                        nuke.message("Warning - SG Pipeline Toolkit!\n\n%s" % msg)
+
+                    # Log the warning.
+                    self.logger.warning(msg)
+
+                # Make sure we are not running Nuke PLE or Non-Commercial!
+                if capabilities.ple:
+                    self.logger.error("The Nuke Engine does not work with Nuke PLE!")
+                    return
+                elif capabilities.nc:
+                    self.logger.error(
+                        "The Nuke Engine does not work with Nuke Non-Commercial!"
+                    )
+                    return
+
+            # Now check that we are at least in a project context. Note that plugin mode
+            # does not require this check since it can operate at the site level.
+            if not self.in_plugin_mode and self.context.project is None:
+                # Must have at least a project in the context to even start!
+                raise sgtk.TankError(
+                    "The nuke engine needs at least a project "
+                    "in the context in order to start! Your "
+                    "context: %s" % self.context
+                )
 
-        # Now check that we are at least in a project context. Note that plugin mode
-        # does not require this check since it can operate at the site level.
-        if not self.in_plugin_mode and self.context.project is None:
-            # Must have at least a project in the context to even start!
-            raise sgtk.TankError(
-                "The nuke engine needs at least a project "
-                "in the context in order to start! Your "
-                "context: %s" % self.context
-            )
+            # Do our mode-specific initializations.
+            if self.hiero_enabled:
+                self.pre_app_init_hiero()
+            elif self.studio_enabled:
+                self.pre_app_init_studio()
+            else:
+                self.pre_app_init_nuke()
 
-        # Do our mode-specific initializations.
-        if self.hiero_enabled:
-            self.pre_app_init_hiero()
-        elif self.studio_enabled:
-            self.pre_app_init_studio()
-        else:
-            self.pre_app_init_nuke()
+        # Apps are loaded between pre_app_init and post_app_init. The phase is
+        # started once pre_app_init is over, so that it is a top level phase.
+        self._startup_profiler.start_phase("app_init")
 
     def pre_app_init_studio(self):
         """
@@ -248,32 +336,67 @@ class NukeEngine(sgtk.platform.Engine):
         # created by file->new or file->open.
         # Store data needed for bootstrapping Sgtk in env vars.
         # Used in classic_startup/sgtk_startup.py, and plugins/basic/Python/tk_nuke_basic/plugin_bootstrap.py
-        os.environ["TANK_ENGINE"] = self.instance_name
-        os.environ["TANK_CONTEXT"] = sgtk.context.serialize(self.context)
+        #
+        # Serializing the context is expensive and this runs on every context change,
+        # so reuse the last serialization while the context stays the same. The
+        # serialization includes the credentials of the current user, so a new
+        # login also requires a new one.
+        context = self.context
+        user = sgtk.get_authenticated_user()
+        cached = self._serialized_context
+        if (
+            cached is None
+            or cached[1] is not user
+            or not (cached[0] is context or cached[0] == context)
+        ):
+            cached = (context, user, sgtk.context.serialize(context))
+            self._serialized_context = cached
+
+        for name, value in (
+            ("TANK_ENGINE", self.instance_name),
+            ("TANK_CONTEXT", cached[2]),
+        ):
+            if os.environ.get(name) != value:
+                os.environ[name] = value
 
     def post_app_init(self):
         """
         Called when all apps have initialized.
         """
-        # Figure out what our menu will be named.
-        menu_name = "ShotGrid"
-        if self.get_setting("use_sgtk_as_menu_name", False):
-            menu_name = "Sgtk"
+        self._startup_profiler.end_phase("app_init")
+
+        with self._startup_profiler.phase("post_app_init"):
+            # Figure out what our menu will be named.
+            menu_name = "ShotGrid"
+            if self.get_setting("use_sgtk_as_menu_name", False):
+                menu_name = "Sgtk"
+
+            # We have some mode-specific initialization to do.
+            if self.hiero_enabled:
+                self.post_app_init_hiero(menu_name)
+            elif self.studio_enabled:
+                self.post_app_init_studio(menu_name)
+
+                # We want to run the Nuke init, as well, to load up
+                # any gizmos, but we don't want it to be part of the
+                # post_app_init_studio method, since we'll also need
+                # to call just the gizmo stuff on context changes and
+                # not the other Nuke Studio-related init stuff.
+                self.post_app_init_nuke(menu_name)
+            else:
+                self.post_app_init_nuke(menu_name)
 
-        # We have some mode-specific initialization to do.
-        if self.hiero_enabled:
-            self.post_app_init_hiero(menu_name)
-        elif self.studio_enabled:
-            self.post_app_init_studio(menu_name)
-
-            # We want to run the Nuke init, as well, to load up
-            # any gizmos, but we don't want it to be part of the
-            # post_app_init_studio method, since we'll also need
-            # to call just the gizmo stuff on context changes and
-            # not the other Nuke Studio-related init stuff.
-            self.post_app_init_nuke(menu_name)
-        else:
-            self.post_app_init_nuke(menu_name)
+        # The startup is over, later calls to post_app_init_nuke come from
+        # context changes and are never deferred.
+        self._startup_deadline = None
+
+        self._startup_profiler.finish(
+            os.path.join(self.cache_location, "startup_profile.json")
+        )
+
+        # Now that the UI is built, finish initializing the apps that deferred
+        # part of their initialization.
+        self._schedule_deferred_app_inits()
 
     def post_app_init_studio(self, menu_name="ShotGrid"):
         """
@@ -289,8 +412,9 @@ class NukeEngine(sgtk.platform.Engine):
             from hiero.core import env as hiero_env
 
             # Create the menu!
-            self._menu_generator = tk_nuke.NukeStudioMenuGenerator(self, menu_name)
-            self._menu_generator.create_menu()
+            with self._startup_profiler.phase("menu_creation"):
+                self._menu_generator = tk_nuke.NukeStudioMenuGenerator(self, menu_name)
+                self._menu_generator.create_menu()
 
             # No context switching in plugin mode.
             if self.in_plugin_mode:
@@ -336,8 +460,9 @@ class NukeEngine(sgtk.platform.Engine):
             from hiero.core import env as hiero_env
 
             # Create the menu!
-            self._menu_generator = tk_nuke.HieroMenuGenerator(self, menu_name)
-            self._menu_generator.create_menu()
+            with self._startup_profiler.phase("menu_creation"):
+                self._menu_generator = tk_nuke.HieroMenuGenerator(self, menu_name)
+                self._menu_generator.create_menu()
 
             hiero.core.events.registerInterest(
                 "kAfterNewProjectCreated",
@@ -356,56 +481,133 @@ class NukeEngine(sgtk.platform.Engine):
         :param menu_name:   The label/name of the menu to be created.
         """
 
-        if self.has_ui and not self.studio_enabled:
-            # Note! not using the import as this confuses Nuke's callback system
-            # (several of the key scene callbacks are in the main init file).
-            import tk_nuke
+        with self._startup_profiler.phase("post_app_init_nuke"):
+            if self.has_ui and not self.studio_enabled:
+                # Note! not using the import as this confuses Nuke's callback system
+                # (several of the key scene callbacks are in the main init file).
+                import tk_nuke
+
+                # Create the menu!
+                #
+                # We keep a reference to any previous menu generators that have
+                # existed. This is to prevent a crash on close in Nuke 11 that occurs
+                # after a context change is triggered.
+                with self._startup_profiler.phase("menu_creation"):
+                    self._previous_generators.append(self._menu_generator)
+                    self._menu_generator = tk_nuke.NukeMenuGenerator(self, menu_name)
+                    self._menu_generator.create_menu()
+
+                # Initialize favourite dirs in the file open/file save dialogs
+                self._run_startup_phase("favourite_dirs", self.__setup_favorite_dirs)
+
+                # Panels are never deferred, as Nuke restores the panels of saved
+                # layouts as soon as it starts.
+                with self._startup_profiler.phase("panel_registration"):
+                    self._register_panels()
+
+            # Gizmo paths are never deferred, as scripts opened when Nuke starts
+            # may need them.
+            with self._startup_profiler.phase("gizmo_paths"):
+                # If an app has a gizmo folder, add it to nuke path. The registry
+                # remembers what was already added, so on context changes only
+                # apps new to the environment are looked at.
+                if self._gizmo_path_registry is None:
+                    import tk_nuke
+
+                    self._gizmo_path_registry = tk_nuke.GizmoPathRegistry()
+                self._gizmo_path_registry.register_apps(self.apps.values())
+
+            # Nuke Studio 9 really doesn't like us running commands at startup, so don't.
+            if self.capabilities.run_at_startup_supported:
+                self._run_startup_phase("run_at_startup", self._run_commands_at_startup)
 
-            # Create the menu!
-            #
-            # We keep a reference to any previous menu generators that have
-            # existed. This is to prevent a crash on close in Nuke 11 that occurs
-            # after a context change is triggered.
-            self._previous_generators.append(self._menu_generator)
-            self._menu_generator = tk_nuke.NukeMenuGenerator(self, menu_name)
-            self._menu_generator.create_menu()
-
-            # Initialize favourite dirs in the file open/file save dialogs
-            self.__setup_favorite_dirs()
+    @property
+    def deferred_startup_phases(self):
+        """
+        Names of the startup phases that were postponed until Nuke was idle
+        because the engine startup went over the ``startup_time_budget``.
+        """
+        return list(self._deferred_startup_phases)
 
-            # Register all panels with nuke's callback system
-            # this will be used at nuke startup in order
-            # for nuke to be able to restore panels
-            # automatically. For all panels that exist as
-            # part of saved layouts, nuke will look through
-            # a global list of registered panels, try to locate
-            # the one it needs and then run the callback.
-            for (panel_id, panel_dict) in self.panels.items():
-                nukescripts.panels.registerPanel(
-                    panel_id,
-                    panel_dict["callback"],
-                )
+    def _run_startup_phase(self, name, callback):
+        """
+        Runs a non-critical phase of the engine startup. Once the startup is
+        over its time budget, the phase is postponed until Nuke is idle instead.
 
-        # Iterate over all apps, if there is a gizmo folder, add it to nuke path.
-        for app in self.apps.values():
-            # Add gizmos to nuke path.
-            app_gizmo_folder = os.path.join(app.disk_location, "gizmos")
-            if os.path.exists(app_gizmo_folder):
-                # Now translate the path so that nuke is happy on Windows.
-                app_gizmo_folder = app_gizmo_folder.replace(os.path.sep, "/")
-                self.logger.debug(
-                    "Gizmos found - Adding %s to nuke.pluginAddPath() and NUKE_PATH",
-                    app_gizmo_folder,
-                )
-                nuke.pluginAddPath(app_gizmo_folder)
-                # And also add it to the plugin path - this is so that any
-                # new processes spawned from this one will have access too.
-                # (for example if you do file->open or file->new)
-                sgtk.util.append_path_to_env_var("NUKE_PATH", app_gizmo_folder)
-
-        # Nuke Studio 9 really doesn't like us running commands at startup, so don't.
-        if not (nuke.env.get("NukeVersionMajor") == 9 and nuke.env.get("studio")):
-            self._run_commands_at_startup()
+        :param str name: Name of the phase.
+        :param callback: Callable taking no arguments running the phase.
+        """
+        if (
+            self.has_ui
+            and self._startup_deadline is not None
+            and time.time() > self._startup_deadline
+        ):
+            self.logger.info(
+                "Engine startup is over its %.2fs budget, deferring '%s' until "
+                "Nuke is idle.",
+                self.get_setting("startup_time_budget"),
+                name,
+            )
+            self._deferred_startup_phases.append(name)
+            self._pending_startup_phases[name] = callback
+            sgtk.platform.qt.QtCore.QTimer.singleShot(
+                0, self._run_next_deferred_startup_phase
+            )
+            return
+
+        with self._startup_profiler.phase(name):
+            callback()
+
+    def _run_next_deferred_startup_phase(self):
+        """
+        Runs the oldest startup phase postponed by :meth:`_run_startup_phase`.
+        """
+        if not self._pending_startup_phases:
+            return
+
+        (name, callback) = self._pending_startup_phases.popitem(last=False)
+        self.logger.debug("Running deferred startup phase '%s'.", name)
+        try:
+            with self._startup_profiler.deferred_phase(name):
+                callback()
+        except Exception:
+            self.logger.exception("Deferred startup phase '%s' failed.", name)
+
+    def _register_panels(self):
+        """
+        Registers all panels with Nuke's callback system.
+        """
+        # This will be used at nuke startup in order
+        # for nuke to be able to restore panels
+        # automatically. For all panels that exist as
+        # part of saved layouts, nuke will look through
+        # a global list of registered panels, try to locate
+        # the one it needs and then run the callback.
+        for (panel_id, panel_dict) in self.panels.items():
+            nukescripts.panels.registerPanel(
+                panel_id,
+                functools.partial(self._run_panel_callback, panel_dict["callback"]),
+            )
+
+    def _run_panel_callback(self, callback):
+        """
+        Creates a panel registered with Nuke. Nuke calls panel callbacks directly
+        when restoring saved layouts, so this makes sure the initialization the
+        panel's app deferred through :meth:`defer_app_init` has run first.
+
+        :param callback: Callback the panel was registered with.
+
+        :returns: Whatever the callback returns.
+        """
+        if self._deferred_app_inits:
+            # Apps register their panels with one of their methods. When the app
+            # can't be told, finish initializing all of them to be safe.
+            app = getattr(callback, "__self__", None)
+            if app not in self.apps.values():
+                app = None
+            self.run_deferred_app_init(app)
+
+        return callback()
 
     @property
     def host_info(self):
@@ -458,28 +660,37 @@ class NukeEngine(sgtk.platform.Engine):
 
         return {"name": app_name, "version": version}
 
+    def register_command(self, *args, **kwargs):
+        """
+        Registers a command with the engine. See
+        :meth:`sgtk.platform.Engine.register_command`.
+        """
+        super(NukeEngine, self).register_command(*args, **kwargs)
+        # The command index is rebuilt the next time it is needed.
+        self._command_index = None
+
     def _run_commands_at_startup(self):
-        # Build a dictionary mapping app instance names to dictionaries of commands they registered with the engine.
-        app_instance_commands = {}
-        for (command_name, value) in self.commands.items():
-            app_instance = value["properties"].get("app")
-            if app_instance:
-                # Add entry 'command name: command function' to the command dictionary of this app instance.
-                command_dict = app_instance_commands.setdefault(
-                    app_instance.instance_name, {}
-                )
-                command_dict[command_name] = value["callback"]
+        # Run the commands once Nuke will have completed its UI update and be idle
+        # in order to run it after the ones that restore the persisted Shotgun app panels.
+        # Each command runs in its own idle slot, so one slow command doesn't
+        # keep Nuke from processing events until all of them have run.
+        import tk_nuke
+
+        self._startup_command_scheduler = tk_nuke.StartupCommandScheduler(
+            budget=self.get_setting("run_at_startup_budget")
+        )
 
-        commands_to_run = []
         # Run the series of app instance commands listed in the 'run_at_startup' setting.
         for app_setting_dict in self.get_setting("run_at_startup", []):
 
             app_instance_name = app_setting_dict["app_instance"]
             # Menu name of the command to run or '' to run all commands of the given app instance.
             setting_command_name = app_setting_dict["name"]
+            # Commands with a higher priority run first.
+            priority = app_setting_dict.get("priority", 0)
 
             # Retrieve the command dictionary of the given app instance.
-            command_dict = app_instance_commands.get(app_instance_name)
+            command_dict = self.command_index.get_app_commands(app_instance_name)
 
             if command_dict is None:
                 self.logger.warning(
@@ -497,7 +708,15 @@ class NukeEngine(sgtk.platform.Engine):
                             app_instance_name,
                             command_name,
                         )
-                        commands_to_run.append(command_function)
+                        self._startup_command_scheduler.add_command(
+                            command_name,
+                            functools.partial(
+                                self._run_startup_command,
+                                app_instance_name,
+                                command_function,
+                            ),
+                            priority,
+                        )
                 else:
                     # Run the command whose name is listed in the 'run_at_startup' setting.
                     command_function = command_dict.get(setting_command_name)
@@ -508,7 +727,15 @@ class NukeEngine(sgtk.platform.Engine):
                             app_instance_name,
                             setting_command_name,
                         )
-                        commands_to_run.append(command_function)
+                        self._startup_command_scheduler.add_command(
+                            setting_command_name,
+                            functools.partial(
+                                self._run_startup_command,
+                                app_instance_name,
+                                command_function,
+                            ),
+                            priority,
+                        )
                     else:
                         known_commands = ", ".join(
                             "'%s'" % name for name in command_dict
@@ -522,28 +749,24 @@ class NukeEngine(sgtk.platform.Engine):
                             known_commands,
                         )
 
-        # Run the commands once Nuke will have completed its UI update and be idle
-        # in order to run it after the ones that restore the persisted Shotgun app panels.
-        # Set the _callback_from_non_pane_menu hint so that the show_panel method knows this
-        # was invoked not from the pane menu.
-
-        def run_at_startup():
-            # FIXME: This pattern is horrible.
-            sgtk._callback_from_non_pane_menu = True
-            try:
-                for command in commands_to_run:
-                    command()
-            finally:
-                delattr(sgtk, "_callback_from_non_pane_menu")
-
-        # We used to call this loop above directly here, but in Nuke 11
+        # We used to run the commands directly here, but in Nuke 11
         # it is causing a deadlock whenever an app calls
         # engine.async_execute_in_main_thread from a background thread.
         # The theory is that the main thread is locked up by Nuke in a
         # way that prevents Toolkit to queue new events. Instead, we'll queue
         # the launch of the apps until the main thread has finished executing
         # current events.
-        sgtk.platform.qt.QtCore.QTimer.singleShot(0, run_at_startup)
+        self._startup_command_scheduler.start()
+
+    def _run_startup_command(self, app_instance_name, command_function):
+        """
+        Runs a command requested by the 'run_at_startup' setting.
+
+        :param str app_instance_name: Instance name of the app owning the command.
+        :param command_function: Callback of the command.
+        """
+        self._run_deferred_app_init(app_instance_name)
+        command_function()
 
     def destroy_engine(self):
         """
@@ -554,6 +777,20 @@ class NukeEngine(sgtk.platform.Engine):
         if self._context_switcher:
             self._context_switcher.destroy()
 
+        # The apps are going away, so their pending initialization is moot.
+        self._deferred_app_inits.clear()
+        self._pending_startup_phases.clear()
+
+        # Print what is left to print, and go back to printing messages one by
+        # one as there may be no event loop to flush them much longer.
+        if self._log_forwarder is not None:
+            self._log_forwarder.flush()
+            self._log_forwarder = None
+
+        if self._log_ring_buffer is not None:
+            sgtk.LogManager().root_logger.removeHandler(self._log_ring_buffer)
+            self._log_ring_buffer = None
+
         if self.has_ui:
             self._menu_generator.destroy_menu()
 
@@ -575,13 +812,140 @@ class NukeEngine(sgtk.platform.Engine):
                     self._handle_studio_selection_change,
                 )
 
+    @property
+    def context_switch_latencies(self):
+        """
+        List of (path, seconds) tuples for the context switches done so far,
+        where path is "warm" for switches that only refreshed the context
+        dependent state and "full" for the others.
+        """
+        return list(self._context_switch_latencies)
+
+    def pre_context_change(self, old_context, new_context):
+        """
+        Records the state needed to tell whether the context change can take
+        the warm path once it completes.
+
+        :param old_context: The sgtk.context.Context being switched away from.
+        :param new_context: The sgtk.context.Context being switched to.
+        """
+        # The commands are kept alive until the switch completes, so that the ids
+        # in their signature can't be reused by the apps created for the new
+        # context.
+        self._context_switch_start = (
+            time.time(),
+            self.environment.get("name"),
+            self._get_command_signature(),
+            list(self.commands.values()),
+        )
+
+    def _get_command_signature(self):
+        """
+        Summarizes the registered commands, so that two sets of commands can be
+        compared cheaply.
+
+        Apps that don't support context changes are created again and register
+        commands with the same names, so the signature identifies the apps and
+        callbacks by id rather than by name.
+
+        :returns: A frozenset of (command name, app id, callback id, command type)
+            tuples, or None if a command is tied to a specific context, in which
+            case the menus always have to be rebuilt.
+        """
+        signature = set()
+        for (name, command) in self.commands.items():
+            properties = command["properties"]
+            if properties.get("context") is not None:
+                return None
+            signature.add(
+                (
+                    name,
+                    id(properties.get("app")),
+                    id(command["callback"]),
+                    properties.get("type"),
+                )
+            )
+        return frozenset(signature)
+
+    def _is_warm_context_switch(self):
+        """
+        Tells whether the context change that just completed kept the
+        environment and the commands of the previous context, in which case
+        only the context dependent state needs to be refreshed.
+        """
+        if not self.get_setting("warm_context_switch", False):
+            return False
+        if self._context_switch_start is None:
+            return False
+
+        (_, environment_name, command_signature, _) = self._context_switch_start
+        return (
+            command_signature is not None
+            and environment_name == self.environment.get("name")
+            and command_signature == self._get_command_signature()
+        )
+
     def post_context_change(self, old_context, new_context):
         """
         Handles post-context-change requirements for Nuke, Hiero, and Nuke Studio.
 
+        When the ``warm_context_switch`` setting is on and the new context uses the
+        same environment and commands as the old one, the menus, gizmo paths and
+        callbacks are all still valid, so only the state that depends on the
+        context is refreshed and the startup commands are run again.
+
         :param old_context: The sgtk.context.Context being switched away from.
         :param new_context: The sgtk.context.Context being switched to.
         """
+        # Apps created for the new context may have deferred part of their
+        # initialization, while the ones torn down won't ever need theirs.
+        self._discard_stale_deferred_app_inits()
+        self._schedule_deferred_app_inits()
+
+        if self._is_warm_context_switch():
+            path = "warm"
+            self._warm_context_change()
+        else:
+            path = "full"
+            self._full_context_change()
+
+        self.logger.debug("tk-nuke context changed to %s", str(new_context))
+
+        if self._context_switch_start is not None:
+            latency = time.time() - self._context_switch_start[0]
+            self._context_switch_latencies.append((path, latency))
+            self.logger.debug("Context switch (%s path) took %.3fs.", path, latency)
+            self._context_switch_start = None
+
+    def _warm_context_change(self):
+        """
+        Refreshes the state that depends on the context after a context change
+        that kept the environment and commands of the previous context.
+        """
+        # Update our environment variables so that if we spawn a new nuke
+        # instance it will start up in the new context.
+        self.pre_app_init_nuke()
+
+        # Startup commands run on every context change, as they do on the full
+        # path.
+        if not self.hiero_enabled and self.capabilities.run_at_startup_supported:
+            self._run_commands_at_startup()
+
+        if not self.has_ui:
+            return
+
+        if self._context_change_menu_rebuild:
+            self.menu_generator.refresh_context_menu()
+
+        # Favourites point to folders resolved from the context.
+        if not self.hiero_enabled and not self.studio_enabled:
+            self.__setup_favorite_dirs()
+
+    def _full_context_change(self):
+        """
+        Reinitializes the engine after a context change that may have changed
+        its environment or commands.
+        """
         # As we've changed contexts, we should update our environment variables so that if we spawn a new nuke instance
         # it will start up in the same environment.
         self.pre_app_init_nuke()
@@ -592,8 +956,6 @@ class NukeEngine(sgtk.platform.Engine):
 
         tk_nuke.tank_ensure_callbacks_registered(engine=self)
 
-        self.logger.debug("tk-nuke context changed to %s", str(new_context))
-
         # We also need to run the post init for Nuke, which will handle
         # getting any gizmos setup.
         if not self.hiero_enabled:
@@ -602,6 +964,109 @@ class NukeEngine(sgtk.platform.Engine):
         if self.has_ui and self._context_change_menu_rebuild:
             self.menu_generator.create_menu()
 
+    #####################################################################################
+    # Deferred App Initialization
+
+    def defer_app_init(self, app, callback):
+        """
+        Defers part of an app's initialization until it is actually needed.
+
+        Apps can call this from their ``init_app`` to register their commands right
+        away, which is cheap, while postponing expensive work like importing large
+        modules. When the ``lazy_app_init`` setting is on and Nuke has a UI, the
+        callback runs the first time one of the app's commands is invoked or one of
+        its panels is restored, or once Nuke is idle after startup or after the
+        context change that created the app, whichever comes first. Otherwise it
+        runs immediately.
+
+        :param app: The app the initialization belongs to.
+        :type app: :class:`sgtk.platform.Application`
+        :param callback: Callable taking no arguments that finishes initializing
+            the app.
+        """
+        if not (self.has_ui and self.get_setting("lazy_app_init", False)):
+            callback()
+            return
+
+        self.logger.debug("Deferring part of the initialization of %s.", app)
+        # The app is kept with its callback, as apps that don't support context
+        # changes are replaced by new instances of the same name.
+        self._deferred_app_inits.setdefault(app.instance_name, []).append(
+            (app, callback)
+        )
+
+    def run_deferred_app_init(self, app=None):
+        """
+        Runs the initialization deferred through :meth:`defer_app_init`. This does
+        nothing if there is none left to run.
+
+        :param app: App to finish initializing. All apps are initialized if omitted.
+        :type app: :class:`sgtk.platform.Application`
+        """
+        if app is None:
+            instance_names = list(self._deferred_app_inits)
+        else:
+            instance_names = [app.instance_name]
+
+        for instance_name in instance_names:
+            self._run_deferred_app_init(instance_name)
+
+    def _run_deferred_app_init(self, instance_name):
+        """
+        Runs the deferred initialization of an app.
+
+        :param str instance_name: Instance name of the app to finish initializing.
+        """
+        for (_, callback) in self._deferred_app_inits.pop(instance_name, []):
+            self.logger.debug("Running deferred initialization of %s.", instance_name)
+            try:
+                callback()
+            except Exception:
+                self.logger.exception(
+                    "Deferred initialization of %s failed.", instance_name
+                )
+
+    def _discard_stale_deferred_app_inits(self):
+        """
+        Forgets the deferred initialization of apps that were torn down, e.g. by
+        a context change, so that it never runs against a destroyed app.
+        """
+        apps = self.apps
+        for instance_name in list(self._deferred_app_inits):
+            current_app = apps.get(instance_name)
+            pending = [
+                (app, callback)
+                for (app, callback) in self._deferred_app_inits[instance_name]
+                if app is current_app
+            ]
+            if pending:
+                self._deferred_app_inits[instance_name] = pending
+            else:
+                del self._deferred_app_inits[instance_name]
+
+    def _schedule_deferred_app_inits(self):
+        """
+        Finishes initializing the apps that deferred part of their initialization,
+        one at a time whenever Nuke is idle.
+        """
+        if self._deferred_app_inits and not self._deferred_app_init_scheduled:
+            self._deferred_app_init_scheduled = True
+            sgtk.platform.qt.QtCore.QTimer.singleShot(
+                0, self._run_next_deferred_app_init
+            )
+
+    def _run_next_deferred_app_init(self):
+        """
+        Finishes initializing the next app with deferred initialization, then
+        schedules the following one so the UI stays responsive in between.
+        """
+        self._deferred_app_init_scheduled = False
+        if not self._deferred_app_inits:
+            return
+
+        self._run_deferred_app_init(next(iter(self._deferred_app_inits)))
+        self._schedule_deferred_app_inits()
+
     #####################################################################################
     # Logging
 
@@ -614,31 +1079,120 @@ class NukeEngine(sgtk.platform.Engine):
         :param record: Std python logging record
         :type record: :class:`~python.logging.LogRecord`
         """
+        if self._log_dispatch is None:
+            self._build_log_dispatch()
+
+        try:
+            console_log = self._log_dispatch[record.levelno]
+        except KeyError:
+            console_log = self._get_console_log_function(record.levelno)
+            self._log_dispatch[record.levelno] = console_log
+
         msg = handler.format(record)
 
         # Sends the message to error console of the DCC
+        if console_log is not None:
+            console_log(msg)
+
+        # Sends the message to the script editor.
+        if self._log_forwarder is not None:
+            self._log_forwarder.add(msg)
+        else:
+            self.async_execute_in_main_thread(print, msg)
+
+    def _build_log_dispatch(self):
+        """
+        Computes the function sending the messages of each standard level to the
+        error console.
+        """
+        self._log_dispatch = dict(
+            (levelno, self._get_console_log_function(levelno))
+            for levelno in (
+                logging.DEBUG,
+                logging.INFO,
+                logging.WARNING,
+                logging.ERROR,
+                logging.CRITICAL,
+            )
+        )
+
+    def _get_console_log_function(self, levelno):
+        """
+        :param int levelno: Level of the messages.
+
+        :returns: Function taking a formatted message and sending it to the
+            error console of the DCC, or None if messages of the given level
+            aren't sent there.
+        """
         if self.hiero_enabled:
             import hiero
 
-            if record.levelno >= logging.ERROR:
-                hiero.core.log.error(msg)
-            elif record.levelno >= logging.WARNING:
-                hiero.core.log.info(msg)
-            elif record.levelno >= logging.INFO:
-                hiero.core.log.info(msg)
+            if levelno >= logging.ERROR:
+                return hiero.core.log.error
+            elif levelno >= logging.INFO:
+                return hiero.core.log.info
             else:
-                hiero.core.log.setLogLevel(hiero.core.log.kDebug)
-                hiero.core.log.debug(msg)
+                return self._log_hiero_debug
         else:
-            if record.levelno >= logging.CRITICAL:
-                nuke.critical("SG Critical: %s" % msg)
-            elif record.levelno >= logging.ERROR:
-                nuke.error("SG Error: %s" % msg)
-            elif record.levelno >= logging.WARNING:
-                nuke.warning("SG Warning: %s" % msg)
+            if levelno >= logging.CRITICAL:
+                return lambda msg: nuke.critical("SG Critical: %s" % msg)
+            elif levelno >= logging.ERROR:
+                return lambda msg: nuke.error("SG Error: %s" % msg)
+            elif levelno >= logging.WARNING:
+                return lambda msg: nuke.warning("SG Warning: %s" % msg)
+            return None
 
-        # Sends the message to the script editor.
-        self.async_execute_in_main_thread(print, msg)
+    def _log_hiero_debug(self, msg):
+        """
+        Sends a debug message to Hiero's error console.
+
+        Debug messages only reach the engine while debug logging is on, which
+        can be toggled at any time, so Hiero's log level is raised to let them
+        through the first time one is sent. Nothing lowers it afterwards.
+
+        :param str msg: Formatted message.
+        """
+        import hiero
+
+        if not self._hiero_debug_level_set:
+            hiero.core.log.setLogLevel(hiero.core.log.kDebug)
+            self._hiero_debug_level_set = True
+        hiero.core.log.debug(msg)
+
+    def dump_log_records(self, path=None):
+        """
+        Writes the most recent records logged through Toolkit, whatever their
+        level, to a file. The number of records kept is controlled by the
+        ``log_ring_buffer_size`` setting.
+
+        :param str path: Path of the file to write. Defaults to a timestamped
+            file in the engine's cache location.
+
+        :returns: The path of the file written, or None if no records are kept.
+        """
+        if self._log_ring_buffer is None:
+            self.logger.warning("Log records aren't kept, there is nothing to dump.")
+            return None
+
+        if path is None:
+            path = os.path.join(
+                self.cache_location,
+                "log_records_%s.log" % time.strftime("%Y%m%d_%H%M%S"),
+            )
+        sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(path))
+        self._log_ring_buffer.dump(path)
+        self.logger.info("Recent log records written to %s", path)
+        return path
+
+    @property
+    def dropped_log_messages(self):
+        """
+        Number of log messages that weren't printed to the Script Editor because
+        they went over the ``log_forwarding_max_rate``.
+        """
+        if self._log_forwarder is None:
+            return 0
+        return self._log_forwarder.dropped
 
     #####################################################################################
     # Panel Support
@@ -706,7 +1260,7 @@ class NukeEngine(sgtk.platform.Engine):
                 if existing_pane:
                     break
 
-            if existing_pane is None and nuke.env.get("NukeVersionMajor") < 9:
+            if existing_pane is None and self.capabilities.panel_requires_pane:
                 # Couldn't find anything to parent next to!
                 # Nuke 9 will automatically handle this situation
                 # but older versions will not show the UI!
@@ -788,14 +1342,15 @@ class NukeEngine(sgtk.platform.Engine):
             # In Nuke 11 and greater the Project.projectRoot and Project.setProjectRoot methods
             # have been deprecated in favour of Project.exportRootDirectory and
             # Project.setProjectDirectory.
-            if nuke.env.get("NukeVersionMajor") >= 11 and not p.exportRootDirectory():
-                self.logger.debug(
-                    "Setting exportRootDirectory on %s to: %s",
-                    p.name(),
-                    self.sgtk.project_path,
-                )
-                p.setProjectDirectory(self.sgtk.project_path)
-            elif nuke.env.get("NukeVersionMajor") <= 10 and not p.projectRoot():
+            if self.capabilities.supports_project_directory:
+                if not p.exportRootDirectory():
+                    self.logger.debug(
+                        "Setting exportRootDirectory on %s to: %s",
+                        p.name(),
+                        self.sgtk.project_path,
+                    )
+                    p.setProjectDirectory(self.sgtk.project_path)
+            elif not p.projectRoot():
                 self.logger.debug(
                     "Setting projectRoot on %s to: %s", p.name(), self.sgtk.project_path
                 )
@@ -810,7 +1365,7 @@ class NukeEngine(sgtk.platform.Engine):
         # for more info. There have been instability issues with nuke 7 causing
         # various crashes, so window parenting on Nuke versions above 6 is
         # currently disabled.
-        if nuke.env.get("NukeVersionMajor") == 7:
+        if self.capabilities.dialog_parenting_unstable:
             return None
         return super(NukeEngine, self)._get_dialog_parent()
 
@@ -934,15 +1489,9 @@ class NukeEngine(sgtk.platform.Engine):
         :return: dict
         """
 
-        nuke_version = (
-            nuke.env.get("NukeVersionMajor"),
-            nuke.env.get("NukeVersionMinor"),
-            nuke.env.get("NukeVersionRelease"),
-        )
-
         # Disable the importing of the web engine widgets submodule from PySide2
         # if this is a Windows environment. Failing to do so will cause Nuke to freeze on startup.
-        if nuke_version[0] > 10 and sgtk.util.is_windows():
+        if self.capabilities.skip_qtwebengine_import:
             self.logger.debug(
                 "Nuke 11+ on Windows can deadlock if QtWebEngineWidgets "
                 "is imported. Setting SHOTGUN_SKIP_QTWEBENGINEWIDGETS_IMPORT=1..."
@@ -959,19 +1508,28 @@ class NukeEngine(sgtk.platform.Engine):
         Nuke currently only writes favorites to disk in ~/.nuke/folders.nk. If you add/remove
         one in the UI. Doing them via the api only updates them for the session (Nuke bug #3740).
         See http://forums.thefoundry.co.uk/phpBB2/viewtopic.php?t=3481&start=15
+
+        This runs on every context change, so only the favorites that differ from the
+        ones applied last time are removed and added again.
         """
         engine_root_dir = self.disk_location
         sg_logo = os.path.abspath(
             os.path.join(engine_root_dir, "resources", "sg_logo_80px.png")
         )
 
-        # Ensure old favorites we used to use are removed.
-        supported_entity_types = ["Shot", "Sequence", "Scene", "Asset", "Project"]
-        for x in supported_entity_types:
-            nuke.removeFavoriteDir("Tank Current %s" % x)
-        nuke.removeFavoriteDir("Tank Current Work")
-        nuke.removeFavoriteDir("SG Current Project")
-        nuke.removeFavoriteDir("SG Current Work")
+        # Ensure old favorites we used to use are removed. They are never added
+        # back, so this only needs to happen once.
+        if not self._legacy_favourites_removed:
+            supported_entity_types = ["Shot", "Sequence", "Scene", "Asset", "Project"]
+            for x in supported_entity_types:
+                nuke.removeFavoriteDir("Tank Current %s" % x)
+            nuke.removeFavoriteDir("Tank Current Work")
+            nuke.removeFavoriteDir("SG Current Project")
+            nuke.removeFavoriteDir("SG Current Work")
+            self._legacy_favourites_removed = True
+
+        # Maps the name of each favorite to its directory and icon.
+        favourites = OrderedDict()
 
         # Add favorties for current project root(s).
         proj = self.context.project
@@ -984,27 +1542,12 @@ class NukeEngine(sgtk.platform.Engine):
                 dir_name = current_proj_fav
                 if len(proj_roots) > 1:
                     dir_name += " (%s)" % root_name
-
-                # Remove old directory
-                nuke.removeFavoriteDir(dir_name)
-
-                # Add new path
-                nuke.addFavoriteDir(
-                    dir_name,
-                    directory=root_path,
-                    type=(nuke.IMAGE | nuke.SCRIPT | nuke.GEO),
-                    icon=sg_logo,
-                    tooltip=root_path,
-                )
+                favourites[dir_name] = (root_path, sg_logo)
 
         # Add favorites directories from the config
         for favorite in self.get_setting("favourite_directories"):
-            # Remove old directory
-            nuke.removeFavoriteDir(favorite["display_name"])
             try:
-                template = self.get_template_by_name(favorite["template_directory"])
-                fields = self.context.as_template_fields(template)
-                path = template.apply_fields(fields)
+                path = self.__get_favorite_template_path(favorite["template_directory"])
             except Exception as e:
                 msg = (
                     "Error processing template '%s' to add to favorite "
@@ -1013,15 +1556,58 @@ class NukeEngine(sgtk.platform.Engine):
                 self.logger.exception(msg)
                 continue
 
-            # Add new directory
             icon_path = favorite.get("icon")
             if not os.path.isfile(icon_path) or not os.path.exists(icon_path):
                 icon_path = sg_logo
 
+            favourites[favorite["display_name"]] = (path, icon_path)
+
+        # The first time around we don't know what is currently set, so every
+        # favorite gets replaced.
+        applied_favourites = self._applied_favourites or {}
+
+        # Remove the favorites that are gone or have changed.
+        for dir_name, favourite in applied_favourites.items():
+            if favourites.get(dir_name) != favourite:
+                nuke.removeFavoriteDir(dir_name)
+
+        # Add the favorites that are new or have changed.
+        for dir_name, (path, icon_path) in favourites.items():
+            if self._applied_favourites is not None:
+                if applied_favourites.get(dir_name) == (path, icon_path):
+                    continue
+            else:
+                # Remove old directory
+                nuke.removeFavoriteDir(dir_name)
+
+            # Add new directory
             nuke.addFavoriteDir(
-                favorite["display_name"],
+                dir_name,
                 directory=path,
                 type=(nuke.IMAGE | nuke.SCRIPT | nuke.GEO),
                 icon=icon_path,
                 tooltip=path,
             )
+
+        self._applied_favourites = favourites
+
+    def __get_favorite_template_path(self, template_name):
+        """
+        Resolves the path of a favorite directory template for the current context.
+
+        The result is cached for each template and reused for as long as the
+        context stays the same.
+
+        :param str template_name: Name of the template to resolve.
+
+        :returns: The resolved path.
+        """
+        cached = self._favourite_template_paths.get(template_name)
+        if cached is not None and cached[0] == self.context:
+            return cached[1]
+
+        template = self.get_template_by_name(template_name)
+        fields = self.context.as_template_fields(template)
+        path = template.apply_fields(fields)
+        self._favourite_template_paths[template_name] = (self.context, path)
+        return path
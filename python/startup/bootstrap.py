@@ -10,6 +10,7 @@
 
 import os
 import sys
+import imp
 
 
 def bootstrap(engine_name, context, app_path, app_args, extra_args):
@@ -23,11 +24,20 @@ def bootstrap(engine_name, context, app_path, app_args, extra_args):
     """
     import tank
 
+    bootstrap_folder = os.path.dirname(
+        os.path.abspath(sys.modules[bootstrap.__module__].__file__)
+    )  # tk-nuke/python/startup
+
+    # Load the path helpers from their file location, like the launcher does,
+    # so that a module of the same name on sys.path can't shadow them.
+    append_unique_paths_to_env_var = imp.load_source(
+        "tk_nuke_startup_nuke_env_paths",
+        os.path.join(bootstrap_folder, "nuke_env_paths.py"),
+    ).append_unique_paths_to_env_var
+
     startup_path = os.path.normpath(
         os.path.join(
-            os.path.dirname(
-                os.path.abspath(sys.modules[bootstrap.__module__].__file__)
-            ),  # tk-nuke/python/startup
+            bootstrap_folder,
             "..",  # tk-nuke/python
             "..",  # tk-nuke
             "classic_startup",
@@ -36,11 +46,19 @@ def bootstrap(engine_name, context, app_path, app_args, extra_args):
     app_args = app_args or ""
 
     if "hiero" in app_path.lower() or "--hiero" in app_args:
-        tank.util.append_path_to_env_var("HIERO_PLUGIN_PATH", startup_path)
+        env_key = "HIERO_PLUGIN_PATH"
     elif "nukestudio" in app_path.lower() or "--studio" in app_args:
-        tank.util.append_path_to_env_var("HIERO_PLUGIN_PATH", startup_path)
+        env_key = "HIERO_PLUGIN_PATH"
     else:
-        tank.util.append_path_to_env_var("NUKE_PATH", startup_path)
+        env_key = "NUKE_PATH"
+
+    removed = append_unique_paths_to_env_var(env_key, [startup_path])
+    if removed:
+        tank.LogManager.get_logger(__name__).debug(
+            "Removed %d duplicate entries from %s.", removed, env_key
+        )
+
+    if env_key == "NUKE_PATH":
         file_to_open = os.environ.get("TANK_FILE_TO_OPEN")
 
         # A Nuke script can't be launched from the menu.py, so we
@@ -0,0 +1,67 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers to build the NUKE_PATH and HIERO_PLUGIN_PATH environment variables.
+
+This module is used both by the launcher and by the legacy bootstrap, so it
+must not import sgtk or nuke.
+"""
+
+import os
+
+
+def join_unique_paths(paths):
+    """
+    Joins paths into a single environment variable value, skipping empty
+    entries and entries pointing to a folder that is already present.
+
+    Paths are compared after normalization, so ``/a/b/`` and ``/a/./b`` are
+    considered the same folder. The first occurrence of a folder is kept, so
+    the search order is preserved.
+
+    :param list paths: List of paths to join.
+
+    :returns: Tuple of the joined path string and the number of duplicate
+        entries that were removed.
+    """
+    unique_paths = []
+    seen = set()
+    removed = 0
+
+    for path in paths:
+        if not path:
+            continue
+
+        key = os.path.normcase(os.path.normpath(path))
+        if key in seen:
+            removed += 1
+            continue
+
+        seen.add(key)
+        unique_paths.append(path)
+
+    return os.pathsep.join(unique_paths), removed
+
+
+def append_unique_paths_to_env_var(env_key, paths):
+    """
+    Appends paths to an environment variable, removing any duplicate entries
+    the variable might already contain.
+
+    :param str env_key: Name of the environment variable to update.
+    :param list paths: List of paths to append.
+
+    :returns: Number of duplicate entries that were removed.
+    """
+    existing_paths = os.environ.get(env_key, "").split(os.pathsep)
+    joined_path_str, removed = join_unique_paths(existing_paths + list(paths))
+    os.environ[env_key] = joined_path_str
+    return removed
@@ -31,6 +31,13 @@ from .menu_generation import (
 )
 
 from .context import ClassicStudioContextSwitcher, PluginStudioContextSwitcher  # noqa
+from .startup_profiler import StartupProfiler  # noqa
+from .gizmo_paths import GizmoPathRegistry  # noqa
+from .startup_commands import StartupCommandScheduler  # noqa
+from .command_index import CommandIndex  # noqa
+from .capabilities import NukeCapabilities  # noqa
+from .log_forwarder import LogForwarder  # noqa
+from .log_ring_buffer import LogRingBuffer  # noqa
 
 logger = sgtk.LogManager.get_logger(__name__)
 
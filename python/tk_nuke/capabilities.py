@@ -0,0 +1,112 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Features of the running version of Nuke."""
+
+from collections import namedtuple
+
+import sgtk
+
+
+_NukeCapabilities = namedtuple(
+    "NukeCapabilities",
+    [
+        # (major, minor, release) version of Nuke.
+        "version",
+        # Modes Nuke is running in.
+        "gui",
+        "hiero",
+        "studio",
+        "ple",
+        "nc",
+        # Hiero projects are configured with setProjectDirectory rather than
+        # the deprecated setProjectRoot. (Nuke 11+)
+        "supports_project_directory",
+        # Closed panels can be deleted with deleteLater. (Before Nuke 11)
+        "delete_later_safe",
+        # Panels can't be shown without a pane to add them to. (Before Nuke 9)
+        "panel_requires_pane",
+        # Parenting dialogs to the main window is unstable. (Nuke 7)
+        "dialog_parenting_unstable",
+        # Importing QtWebEngineWidgets deadlocks Nuke. (Nuke 11+ on Windows)
+        "skip_qtwebengine_import",
+        # Commands can be run at startup. (All but Nuke Studio 9)
+        "run_at_startup_supported",
+    ],
+)
+
+
+class NukeCapabilities(_NukeCapabilities):
+    """
+    Immutable snapshot of the version of Nuke that is running and of the
+    features that depend on it.
+
+    Use :meth:`from_env` to compute it from ``nuke.env``, or instantiate it
+    directly to test code paths against a given set of capabilities.
+    """
+
+    __slots__ = ()
+
+    # Oldest version of Nuke the engine supports.
+    MINIMUM_VERSION = (7, 0, 10)
+
+    # Newest (major, minor) version of Nuke the engine was tested with.
+    LATEST_TESTED_VERSION = (13, 1)
+
+    @classmethod
+    def from_env(cls, env, is_windows=None):
+        """
+        Computes the capabilities from Nuke's environment.
+
+        :param env: Mapping of Nuke's environment, usually ``nuke.env``.
+        :param bool is_windows: Whether Nuke runs on Windows. Defaults to the
+            current OS.
+
+        :returns: A :class:`NukeCapabilities` instance.
+        """
+        if is_windows is None:
+            is_windows = sgtk.util.is_windows()
+
+        version = (
+            env.get("NukeVersionMajor") or 0,
+            env.get("NukeVersionMinor") or 0,
+            env.get("NukeVersionRelease") or 0,
+        )
+        major = version[0]
+        studio = bool(env.get("studio"))
+
+        return cls(
+            version=version,
+            gui=bool(env.get("gui")),
+            hiero=bool(env.get("hiero")),
+            studio=studio,
+            ple=bool(env.get("ple")),
+            nc=bool(env.get("nc")),
+            supports_project_directory=major >= 11,
+            delete_later_safe=major < 11,
+            panel_requires_pane=major < 9,
+            dialog_parenting_unstable=major == 7,
+            skip_qtwebengine_import=major > 10 and is_windows,
+            run_at_startup_supported=not (major == 9 and studio),
+        )
+
+    @property
+    def is_supported_version(self):
+        """
+        Whether the engine supports this version of Nuke.
+        """
+        return self.version >= self.MINIMUM_VERSION
+
+    @property
+    def is_tested_version(self):
+        """
+        Whether the engine was tested with this version of Nuke.
+        """
+        return self.version[:2] <= self.LATEST_TESTED_VERSION
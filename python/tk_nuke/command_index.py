@@ -0,0 +1,60 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Lookup of the commands registered with the engine."""
+
+from collections import OrderedDict
+
+
+class CommandIndex(object):
+    """
+    Index of the commands registered with the engine by app instance, so that
+    commands can be looked up without scanning all of them.
+    """
+
+    def __init__(self, commands, apps):
+        """
+        :param dict commands: Commands registered with the engine, as returned by
+            ``engine.commands``.
+        :param dict apps: Apps loaded by the engine keyed by instance name, as
+            returned by ``engine.apps``.
+        """
+        self._app_instance_names = {}
+        for app_instance_name, app in apps.items():
+            self._app_instance_names[id(app)] = app_instance_name
+
+        # Maps app instance names to an ordered dictionary of their commands'
+        # callbacks, keyed by command name.
+        self._app_commands = {}
+        for command_name, command in commands.items():
+            app = command["properties"].get("app")
+            if app:
+                app_commands = self._app_commands.setdefault(
+                    app.instance_name, OrderedDict()
+                )
+                app_commands[command_name] = command["callback"]
+
+    def get_app_instance_name(self, app):
+        """
+        :param app: An app loaded by the engine.
+
+        :returns: The instance name of the app, or None if the app isn't loaded
+            by the engine.
+        """
+        return self._app_instance_names.get(id(app))
+
+    def get_app_commands(self, app_instance_name):
+        """
+        :param str app_instance_name: Instance name of an app.
+
+        :returns: Ordered dictionary of the app's command callbacks keyed by command
+            name, or None if no such app registered commands.
+        """
+        return self._app_commands.get(app_instance_name)
@@ -0,0 +1,107 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Registration of the gizmo folders shipped with apps."""
+
+import os
+import imp
+
+import nuke
+import sgtk
+
+logger = sgtk.LogManager.get_logger(__name__)
+
+# The environment path helpers are shared with the launcher, and don't live in
+# an importable package. See startup.py.
+nuke_env_paths = imp.load_source(
+    "tk_nuke_startup_nuke_env_paths",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "startup",
+        "nuke_env_paths.py",
+    ),
+)
+
+
+class GizmoPathRegistry(object):
+    """
+    Adds the ``gizmos`` folder of apps to Nuke's plugin path and to ``NUKE_PATH``.
+
+    App locations are only probed for a gizmo folder once, and a folder is only
+    added once per session, so context changes only pay for apps that are new
+    to the incoming environment.
+    """
+
+    def __init__(self):
+        # Gizmo folder found in each probed app location, None if there is none.
+        self._gizmo_folders = {}
+        # Normalized folders already known to Nuke, including the ones Nuke
+        # picked up from NUKE_PATH when it started.
+        self._registered = set(self._normalize(path) for path in nuke.pluginPath())
+
+    def _normalize(self, path):
+        """
+        :returns: Version of the path that can be compared with other paths.
+        """
+        return os.path.normcase(os.path.normpath(path))
+
+    def _get_gizmo_folder(self, disk_location):
+        """
+        Looks for the gizmo folder of an app. Locations are only probed once.
+
+        :param str disk_location: Location of the app on disk.
+
+        :returns: Path to the gizmo folder, in the format Nuke expects, or None
+            if the app has no gizmos.
+        """
+        if disk_location not in self._gizmo_folders:
+            gizmo_folder = os.path.join(disk_location, "gizmos")
+            if os.path.exists(gizmo_folder):
+                # Now translate the path so that nuke is happy on Windows.
+                gizmo_folder = gizmo_folder.replace(os.path.sep, "/")
+            else:
+                gizmo_folder = None
+            self._gizmo_folders[disk_location] = gizmo_folder
+
+        return self._gizmo_folders[disk_location]
+
+    def register_apps(self, apps):
+        """
+        Registers the gizmo folders of the given apps that haven't been
+        registered yet.
+
+        :param apps: Apps to register the gizmo folders of.
+
+        :returns: List of the gizmo folders that were registered.
+        """
+        registered = []
+        for app in apps:
+            gizmo_folder = self._get_gizmo_folder(app.disk_location)
+            if gizmo_folder is None:
+                continue
+
+            key = self._normalize(gizmo_folder)
+            if key in self._registered:
+                continue
+
+            logger.debug(
+                "Gizmos found - Adding %s to nuke.pluginAddPath() and NUKE_PATH",
+                gizmo_folder,
+            )
+            nuke.pluginAddPath(gizmo_folder)
+            self._registered.add(key)
+            registered.append(gizmo_folder)
+
+            # And also add it to the plugin path - this is so that any
+            # new processes spawned from this one will have access too.
+            # (for example if you do file->open or file->new)
+            nuke_env_paths.append_unique_paths_to_env_var("NUKE_PATH", [gizmo_folder])
+
+        return registered
@@ -0,0 +1,117 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Batched forwarding of log messages to the Script Editor."""
+
+from __future__ import print_function
+
+import collections
+import threading
+import time
+
+
+class LogForwarder(object):
+    """
+    Collects log messages from any thread and prints them to the Script Editor
+    from the main thread, in batches.
+
+    The first message of a batch schedules a flush on the main thread, which
+    waits for :attr:`FLUSH_INTERVAL` milliseconds so that the messages logged in
+    the meantime are printed together. Messages logged beyond the maximum rate
+    are dropped and counted, and the number of dropped messages is reported
+    with the next batch.
+    """
+
+    # Number of milliseconds messages are collected for before being printed.
+    FLUSH_INTERVAL = 100
+
+    def __init__(self, engine, max_rate=0):
+        """
+        :param engine: The engine used to run code on the main thread.
+        :type engine: :class:`sgtk.platform.Engine`
+        :param int max_rate: Maximum number of messages forwarded per second.
+            Messages are never dropped if 0.
+        """
+        self._engine = engine
+        self._max_rate = max_rate
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._flush_scheduled = False
+        # Start and message count of the current one second rate window.
+        self._window_start = 0.0
+        self._window_count = 0
+        # Messages dropped in total, and since the last flush.
+        self._dropped = 0
+        self._unreported_dropped = 0
+
+    @property
+    def dropped(self):
+        """
+        Number of messages dropped so far because they went over the maximum rate.
+        """
+        return self._dropped
+
+    def add(self, msg):
+        """
+        Queues a message to be printed to the Script Editor. This can be called
+        from any thread.
+
+        :param str msg: The formatted message.
+        """
+        with self._lock:
+            if self._max_rate:
+                now = time.time()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                if self._window_count >= self._max_rate:
+                    # Still flush, so the drop gets reported.
+                    self._dropped += 1
+                    self._unreported_dropped += 1
+                    msg = None
+                else:
+                    self._window_count += 1
+
+            if msg is not None:
+                self._pending.append(msg)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        self._engine.async_execute_in_main_thread(self._schedule_flush)
+
+    def _schedule_flush(self):
+        """
+        Flushes the pending messages once the flush interval has elapsed. This
+        must run on the main thread.
+        """
+        from sgtk.platform.qt import QtCore
+
+        QtCore.QTimer.singleShot(self.FLUSH_INTERVAL, self.flush)
+
+    def flush(self):
+        """
+        Prints the pending messages to the Script Editor. This must run on the
+        main thread.
+        """
+        with self._lock:
+            messages = list(self._pending)
+            self._pending.clear()
+            dropped = self._unreported_dropped
+            self._unreported_dropped = 0
+            self._flush_scheduled = False
+
+        if dropped:
+            messages.append(
+                "SG: %d log message(s) were dropped because more than %d messages "
+                "were logged per second." % (dropped, self._max_rate)
+            )
+        if messages:
+            print("\n".join(messages))
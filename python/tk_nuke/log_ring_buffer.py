@@ -0,0 +1,159 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""In-memory history of the most recent log records."""
+
+import itertools
+import logging
+import time
+
+# Used to format the exceptions of the entries being dumped.
+_formatter = logging.Formatter()
+
+
+class LogEntry(object):
+    """
+    Compact copy of a log record. The message and exception are only formatted
+    when the entry is read.
+    """
+
+    __slots__ = ("created", "levelno", "name", "msg", "args", "exc_info")
+
+    def __init__(self):
+        self.created = None
+        self.levelno = None
+        self.name = None
+        self.msg = None
+        self.args = None
+        self.exc_info = None
+
+    def get_message(self):
+        """
+        :returns: The message of the record, merged with its arguments.
+        """
+        if not self.args:
+            return str(self.msg)
+        try:
+            return str(self.msg) % self.args
+        except Exception:
+            return "%s %% %r" % (self.msg, self.args)
+
+    def format(self):
+        """
+        :returns: Description of the record, on one line unless the record
+            holds an exception.
+        """
+        text = "%s.%03d %-8s %s: %s" % (
+            time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created)),
+            (self.created % 1) * 1000,
+            logging.getLevelName(self.levelno),
+            self.name,
+            self.get_message(),
+        )
+        if self.exc_info:
+            text += "\n" + _formatter.formatException(self.exc_info)
+        return text
+
+
+class LogRingBuffer(logging.Handler):
+    """
+    Log handler keeping the most recent log records in a fixed-size ring of
+    preallocated entries, so that they can be written to disk after something
+    went wrong.
+
+    Adding a record only copies a few of its attributes into the next entry,
+    and can be done from any thread without locking.
+    """
+
+    def __init__(self, size=1000):
+        """
+        :param int size: Number of records to keep.
+        """
+        logging.Handler.__init__(self)
+        self._size = size
+        self._entries = [LogEntry() for _ in range(size)]
+        # Calling next() on a count is atomic, so threads never share an entry.
+        self._counter = itertools.count()
+        self._count = 0
+
+    @property
+    def size(self):
+        """
+        Number of records the buffer keeps.
+        """
+        return self._size
+
+    def handle(self, record):
+        """
+        Adds the record if it passes the handler's filters. Unlike the base
+        implementation, this doesn't lock the handler.
+
+        :param record: Std python logging record
+        :type record: :class:`~python.logging.LogRecord`
+
+        :returns: Whether the record was added.
+        """
+        if not self.filter(record):
+            return False
+        self.append(record)
+        return True
+
+    def emit(self, record):
+        """
+        Adds a record. See :meth:`append`.
+
+        :param record: Std python logging record
+        :type record: :class:`~python.logging.LogRecord`
+        """
+        self.append(record)
+
+    def append(self, record):
+        """
+        Adds a record, replacing the oldest one when the buffer is full.
+
+        :param record: Std python logging record
+        :type record: :class:`~python.logging.LogRecord`
+        """
+        args = record.args
+        if isinstance(args, dict):
+            # Arguments passed as a mapping can be changed once logged.
+            args = dict(args)
+
+        index = next(self._counter)
+        entry = self._entries[index % self._size]
+        entry.created = record.created
+        entry.levelno = record.levelno
+        entry.name = record.name
+        entry.msg = record.msg
+        entry.args = args
+        entry.exc_info = record.exc_info
+        self._count = index + 1
+
+    def get_entries(self):
+        """
+        :returns: List of the :class:`LogEntry` kept, oldest first.
+        """
+        count = self._count
+        if count <= self._size:
+            entries = self._entries[:count]
+        else:
+            start = count % self._size
+            entries = self._entries[start:] + self._entries[:start]
+        return [entry for entry in entries if entry.created is not None]
+
+    def dump(self, path):
+        """
+        Writes the records kept to a file, one line per record, oldest first.
+
+        :param str path: Path of the file to write.
+        """
+        with open(path, "w") as fh:
+            for entry in self.get_entries():
+                fh.write(entry.format() + "\n")
@@ -16,6 +16,9 @@ import nuke
 import os
 import unicodedata
 import traceback
+import contextlib
+import time
+from collections import OrderedDict
 from tank_vendor import six
 import nukescripts.openurl
 import nukescripts
@@ -38,6 +41,8 @@ class BaseMenuGenerator(object):
         """
         self._engine = engine
         self._menu_name = menu_name
+        self._build_stats = {}
+        self._build_start = None
 
         engine_root_dir = self.engine.disk_location
         self._shotgun_logo = os.path.abspath(
@@ -69,6 +74,91 @@ class BaseMenuGenerator(object):
         """
         return self._menu_name
 
+    @property
+    def build_stats(self):
+        """
+        Statistics about the last time the menu was built. This is a dictionary
+        with the number of commands added to the menus, under the ``commands``,
+        ``favourites``, ``node_commands``, ``pane_commands`` and
+        ``context_menu_commands`` keys, the seconds spent in each phase of the
+        build under ``phases``, and the total under ``total_seconds``. It is empty
+        if the menu was never built.
+        """
+        stats = dict(self._build_stats)
+        if "phases" in stats:
+            stats["phases"] = OrderedDict(stats["phases"])
+        return stats
+
+    def _index_menu_items(self, menu_items):
+        """
+        Indexes menu items so that the ones named in settings like
+        ``menu_favourites`` can be found without scanning them all.
+
+        :param list menu_items: The :class:`BaseAppCommand` objects to index.
+
+        :returns: Dictionary keyed by (app instance name, command name) tuples,
+            where each value is a list of (position in menu_items, menu item)
+            tuples, in menu_items order.
+        """
+        index = {}
+        for (position, cmd) in enumerate(menu_items):
+            index.setdefault((cmd.app_instance_name, cmd.name), []).append(
+                (position, cmd)
+            )
+        return index
+
+    def _start_build_stats(self):
+        """
+        Resets the statistics before the menu is built.
+        """
+        self._build_start = time.time()
+        self._build_stats = {
+            "commands": 0,
+            "favourites": 0,
+            "node_commands": 0,
+            "pane_commands": 0,
+            "context_menu_commands": 0,
+            "phases": OrderedDict(),
+            "total_seconds": None,
+        }
+
+    @contextlib.contextmanager
+    def _build_phase(self, name):
+        """
+        Context manager adding the time spent in the code it wraps to a phase
+        of the menu build.
+
+        :param str name: Name of the phase.
+        """
+        before = time.time()
+        try:
+            yield
+        finally:
+            phases = self._build_stats["phases"]
+            phases[name] = phases.get(name, 0.0) + time.time() - before
+
+    def _finish_build_stats(self):
+        """
+        Records the total time the build took and logs the statistics.
+        """
+        stats = self._build_stats
+        stats["total_seconds"] = time.time() - self._build_start
+        self.engine.logger.debug(
+            "%s menu built in %.3fs with %d commands, %d favourites, %d node "
+            "commands, %d pane commands and %d context menu commands (%s)",
+            self._menu_name,
+            stats["total_seconds"],
+            stats["commands"],
+            stats["favourites"],
+            stats["node_commands"],
+            stats["pane_commands"],
+            stats["context_menu_commands"],
+            ", ".join(
+                "%s %.3fs" % (name, seconds)
+                for (name, seconds) in stats["phases"].items()
+            ),
+        )
+
     def create_sgtk_error_menu(self):
         """
         Creates an "error" menu item.
@@ -99,6 +189,14 @@ class BaseMenuGenerator(object):
         )
         self._disable_menu("[Toolkit is disabled - Click for details]", msg)
 
+    def refresh_context_menu(self):
+        """
+        Updates the menu after the engine's context changed while its commands
+        stayed the same. Deriving classes only rebuild the context menu, this
+        default implementation recreates the whole menu.
+        """
+        self.create_menu()
+
     def create_disabled_menu(self, cmd_name, msg):
         """
         Implemented in deriving classes to create a "disabled" menu.
@@ -132,6 +230,18 @@ class BaseMenuGenerator(object):
         url = self.engine.context.shotgun_url
         QtGui.QDesktopServices.openUrl(QtCore.QUrl(url))
 
+    def _dump_log_records(self):
+        """
+        Writes the engine's recent log records to disk and tells the user where.
+        """
+        from sgtk.platform.qt import QtGui
+
+        path = self.engine.dump_log_records()
+        if path:
+            QtGui.QMessageBox.information(
+                None, "Recent Log Records", "Log records written to:\n%s" % path
+            )
+
     def _jump_to_fs(self):
         """
         Jump from a context to the filesystem.
@@ -170,6 +280,8 @@ class HieroMenuGenerator(BaseMenuGenerator):
         """
         super(HieroMenuGenerator, self).__init__(engine, menu_name)
         self._menu_handle = None
+        self._context_menu = None
+        self._context_menu_commands = []
         self._context_menus_to_apps = dict()
 
     def _create_hiero_menu(self, add_commands=True, commands=None):
@@ -204,28 +316,31 @@ class HieroMenuGenerator(BaseMenuGenerator):
             return
 
         # Now add the context item on top of the main menu.
-        self._context_menu = self._add_context_menu()
-        self._menu_handle.addSeparator()
+        with self._build_phase("context_menu"):
+            self._context_menu = self._add_context_menu()
+            self._menu_handle.addSeparator()
 
         if not commands:
             return
 
         # Now enumerate all items and create menu objects for them.
-        menu_items = []
-        for (cmd_name, cmd_details) in commands.items():
-            menu_items.append(HieroAppCommand(self.engine, cmd_name, cmd_details))
+        with self._build_phase("command_wrapping"):
+            menu_items = []
+            for (cmd_name, cmd_details) in commands.items():
+                menu_items.append(HieroAppCommand(self.engine, cmd_name, cmd_details))
+            menu_items_index = self._index_menu_items(menu_items)
+        self._build_stats["commands"] += len(menu_items)
 
         # Now add favourites.
-        for fav in self.engine.get_setting("menu_favourites"):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-            # Scan through all menu items.
-            for cmd in menu_items:
-                if cmd.app_instance_name == app_instance_name and cmd.name == menu_name:
+        with self._build_phase("favourites"):
+            for fav in self.engine.get_setting("menu_favourites"):
+                key = (fav["app_instance"], fav["name"])
+                for (_, cmd) in menu_items_index.get(key, []):
                     # Found our match!
                     cmd.add_command_to_menu(self._menu_handle)
                     # Mark as a favourite item.
                     cmd.favourite = True
+                    self._build_stats["favourites"] += 1
 
         # Get the apps for the various context menus.
         self._context_menus_to_apps = {
@@ -234,27 +349,23 @@ class HieroMenuGenerator(BaseMenuGenerator):
             "spreadsheet_context_menu": [],
         }
 
-        remove = set()
-        for (key, apps) in self._context_menus_to_apps.items():
-            items = self.engine.get_setting(key)
-            for item in items:
-                app_instance_name = item["app_instance"]
-                menu_name = item["name"]
-                # Scan through all menu items.
-                for (i, cmd) in enumerate(menu_items):
-                    if (
-                        cmd.app_instance_name == app_instance_name
-                        and cmd.name == menu_name
-                    ):
-                        # Found the match.
-                        apps.append(cmd)
-                        cmd.requires_selection = item["requires_selection"]
-                        if not item["keep_in_menu"]:
-                            remove.add(i)
-                        break
-
-        for index in sorted(remove, reverse=True):
-            del menu_items[index]
+        with self._build_phase("context_menu_settings"):
+            remove = set()
+            for (key, apps) in self._context_menus_to_apps.items():
+                items = self.engine.get_setting(key)
+                for item in items:
+                    matches = menu_items_index.get((item["app_instance"], item["name"]))
+                    if not matches:
+                        continue
+                    # Only the first match is used.
+                    (i, cmd) = matches[0]
+                    apps.append(cmd)
+                    cmd.requires_selection = item["requires_selection"]
+                    if not item["keep_in_menu"]:
+                        remove.add(i)
+
+            for index in sorted(remove, reverse=True):
+                del menu_items[index]
 
         # Register for the interesting events.
         hiero.core.events.registerInterest(
@@ -277,22 +388,27 @@ class HieroMenuGenerator(BaseMenuGenerator):
         # Now go through all of the menu items.
         # Separate them out into various sections.
         commands_by_app = {}
+        self._context_menu_commands = []
 
-        for cmd in menu_items:
-            if cmd.type == "context_menu":
-                cmd.add_command_to_menu(self._context_menu)
-            else:
-                # Normal menu.
-                app_name = cmd.app_name
-                if app_name is None:
-                    # Unparented app.
-                    app_name = "Other Items"
-                if not app_name in commands_by_app:
-                    commands_by_app[app_name] = []
-                commands_by_app[app_name].append(cmd)
+        with self._build_phase("command_menus"):
+            for cmd in menu_items:
+                if cmd.type == "context_menu":
+                    cmd.add_command_to_menu(self._context_menu)
+                    self._context_menu_commands.append(cmd)
+                else:
+                    # Normal menu.
+                    app_name = cmd.app_name
+                    if app_name is None:
+                        # Unparented app.
+                        app_name = "Other Items"
+                    if not app_name in commands_by_app:
+                        commands_by_app[app_name] = []
+                    commands_by_app[app_name].append(cmd)
+        self._build_stats["context_menu_commands"] += len(self._context_menu_commands)
 
         # Now add all apps to main menu.
-        self._add_app_menu(commands_by_app)
+        with self._build_phase("app_menus"):
+            self._add_app_menu(commands_by_app)
 
     def create_menu(self, add_commands=True):
         """
@@ -303,9 +419,13 @@ class HieroMenuGenerator(BaseMenuGenerator):
                                 will be created, but no contents will be
                                 added. Defaults to True.
         """
-        self._create_hiero_menu(
-            add_commands=add_commands, commands=self.engine.commands
-        )
+        self._start_build_stats()
+        try:
+            self._create_hiero_menu(
+                add_commands=add_commands, commands=self.engine.commands
+            )
+        finally:
+            self._finish_build_stats()
 
     def destroy_menu(self):
         """
@@ -368,9 +488,24 @@ class HieroMenuGenerator(BaseMenuGenerator):
             cmd.add_command_to_menu(event.menu, enabled)
         event.menu.addSeparator()
 
-    def _add_context_menu(self):
+    def refresh_context_menu(self):
         """
-        Adds a context menu which displays the current context.
+        Renames the context menu after the engine's current context and
+        repopulates it, leaving the rest of the menu untouched.
+        """
+        if self._menu_handle is None or self._context_menu is None:
+            self.create_menu()
+            return
+
+        self._context_menu.clear()
+        self._context_menu.setTitle(self._get_context_menu_name())
+        self._populate_context_menu(self._context_menu)
+        for cmd in self._context_menu_commands:
+            cmd.add_command_to_menu(self._context_menu)
+
+    def _get_context_menu_name(self):
+        """
+        :returns: The label of the context menu for the current context.
         """
         ctx = self.engine.context
 
@@ -391,17 +526,34 @@ class HieroMenuGenerator(BaseMenuGenerator):
             # e.g. [Lighting, Shot ABC_123]
             ctx_name = "%s, %s %s" % (task_step, ctx.entity["type"], ctx.entity["name"])
 
+        return ctx_name
+
+    def _add_context_menu(self):
+        """
+        Adds a context menu which displays the current context.
+        """
         # create the menu object
-        ctx_menu = self._menu_handle.addMenu(ctx_name)
+        ctx_menu = self._menu_handle.addMenu(self._get_context_menu_name())
+        self._populate_context_menu(ctx_menu)
+        return ctx_menu
+
+    def _populate_context_menu(self, ctx_menu):
+        """
+        Adds the items shared by all contexts to the context menu.
+
+        :param ctx_menu: The context menu to add the items to.
+        """
         action = ctx_menu.addAction("Jump to ShotGrid")
         action.triggered.connect(self._jump_to_sg)
 
-        if ctx.filesystem_locations:
+        if self.engine.context.filesystem_locations:
             action = ctx_menu.addAction("Jump to File System")
             action.triggered.connect(self._jump_to_fs)
 
+        action = ctx_menu.addAction("Dump Recent Log Records")
+        action.triggered.connect(self._dump_log_records)
+
         ctx_menu.addSeparator()
-        return ctx_menu
 
     def _add_app_menu(self, commands_by_app):
         """
@@ -456,6 +608,18 @@ class NukeStudioMenuGenerator(HieroMenuGenerator):
             added for all engine commands. If False, the menus will be created,
             but will not be populated with engine commands.
         """
+        self._start_build_stats()
+        try:
+            self._create_studio_menu(add_commands)
+        finally:
+            self._finish_build_stats()
+
+    def _create_studio_menu(self, add_commands):
+        """
+        Creates the Hiero-style menu and the node menu of Nuke Studio.
+
+        :param bool add_commands: Whether to add the engine commands to the menus.
+        """
         # We're going to divide up the engine command. For "node" type commands,
         # which are commands from apps like tk-nuke-quickdailies, or tk-nuke-writenode,
         # we register them in the Nuke-style node context menu. For everything else, we
@@ -463,11 +627,12 @@ class NukeStudioMenuGenerator(HieroMenuGenerator):
         node_commands = dict()
         non_node_commands = dict()
 
-        for cmd_name, cmd_details in self.engine.commands.items():
-            if self._is_node_command(cmd_name, cmd_details):
-                node_commands[cmd_name] = cmd_details
-            else:
-                non_node_commands[cmd_name] = cmd_details
+        with self._build_phase("command_wrapping"):
+            for cmd_name, cmd_details in self.engine.commands.items():
+                if self._is_node_command(cmd_name, cmd_details):
+                    node_commands[cmd_name] = cmd_details
+                else:
+                    non_node_commands[cmd_name] = cmd_details
 
         self._create_hiero_menu(add_commands=add_commands, commands=non_node_commands)
 
@@ -479,18 +644,21 @@ class NukeStudioMenuGenerator(HieroMenuGenerator):
         if not add_commands:
             return
 
-        for (cmd_name, cmd_details) in node_commands.items():
-            cmd = NukeAppCommand(self.engine, cmd_name, cmd_details)
+        self._build_stats["commands"] += len(node_commands)
+        with self._build_phase("node_menu"):
+            for (cmd_name, cmd_details) in node_commands.items():
+                cmd = NukeAppCommand(self.engine, cmd_name, cmd_details)
 
-            # Get icon if specified - default to sgtk icon if not specified.
-            icon = cmd.properties.get("icon", self._shotgun_logo)
-            command_context = cmd.properties.get("context")
+                # Get icon if specified - default to sgtk icon if not specified.
+                icon = cmd.properties.get("icon", self._shotgun_logo)
+                command_context = cmd.properties.get("context")
 
-            # If the app recorded a context that it wants the command to be associated
-            # with, we need to check it against the current engine context. If they
-            # don't match then we don't add it.
-            if command_context is None or command_context is self.engine.context:
-                node_menu_handle.addCommand(cmd.name, cmd.callback, icon=icon)
+                # If the app recorded a context that it wants the command to be associated
+                # with, we need to check it against the current engine context. If they
+                # don't match then we don't add it.
+                if command_context is None or command_context is self.engine.context:
+                    node_menu_handle.addCommand(cmd.name, cmd.callback, icon=icon)
+                    self._build_stats["node_commands"] += 1
 
     def create_disabled_menu(self, cmd_name, msg):
         """
@@ -531,6 +699,8 @@ class NukeMenuGenerator(BaseMenuGenerator):
         """
         super(NukeMenuGenerator, self).__init__(engine, menu_name)
         self._dialogs = []
+        self._context_menu_name = None
+        self._context_menu_commands = []
 
     def create_menu(self, add_commands=True):
         """
@@ -541,6 +711,18 @@ class NukeMenuGenerator(BaseMenuGenerator):
                                 will be created, but no contents will be
                                 added. Defaults to True.
         """
+        self._start_build_stats()
+        try:
+            self._create_nuke_menu(add_commands)
+        finally:
+            self._finish_build_stats()
+
+    def _create_nuke_menu(self, add_commands):
+        """
+        Creates the main, node and pane menus of Nuke.
+
+        :param bool add_commands: Whether to add the engine commands to the menus.
+        """
         # Create main Shotgun menu.
         menu_handle = nuke.menu("Nuke").addMenu(self._menu_name)
         node_menu_handle = nuke.menu("Nodes").addMenu(
@@ -559,72 +741,84 @@ class NukeMenuGenerator(BaseMenuGenerator):
             return
 
         # Now add the context item on top of the main menu.
-        self._context_menu = self._add_context_menu(menu_handle)
-        menu_handle.addSeparator()
+        with self._build_phase("context_menu"):
+            self._context_menu = self._add_context_menu(menu_handle)
+            menu_handle.addSeparator()
 
         # Now enumerate all items and create menu objects for them.
-        menu_items = []
-        for (cmd_name, cmd_details) in self.engine.commands.items():
-            menu_items.append(NukeAppCommand(self.engine, cmd_name, cmd_details))
+        with self._build_phase("command_wrapping"):
+            menu_items = []
+            for (cmd_name, cmd_details) in self.engine.commands.items():
+                menu_items.append(NukeAppCommand(self.engine, cmd_name, cmd_details))
 
-        # Sort the list of commands in name order.
-        menu_items.sort(key=lambda x: x.name)
+            # Sort the list of commands in name order.
+            menu_items.sort(key=lambda x: x.name)
+            menu_items_index = self._index_menu_items(menu_items)
+        self._build_stats["commands"] += len(menu_items)
 
         # Now add favourites.
-        for fav in self.engine.get_setting("menu_favourites"):
-            app_instance_name = fav["app_instance"]
-            menu_name = fav["name"]
-            hotkey = fav.get("hotkey")
-
-            # Scan through all menu items.
-            for cmd in menu_items:
-                if cmd.app_instance_name == app_instance_name and cmd.name == menu_name:
+        with self._build_phase("favourites"):
+            for fav in self.engine.get_setting("menu_favourites"):
+                hotkey = fav.get("hotkey")
+                key = (fav["app_instance"], fav["name"])
+                for (_, cmd) in menu_items_index.get(key, []):
                     # Found our match!
                     cmd.add_command_to_menu(menu_handle, hotkey=hotkey)
                     # Mark as a favourite item.
                     cmd.favourite = True
-        menu_handle.addSeparator()
+                    self._build_stats["favourites"] += 1
+            menu_handle.addSeparator()
 
         # Now go through all of the menu items.
         # Separate them out into various sections.
         commands_by_app = {}
+        self._context_menu_commands = []
 
-        for cmd in menu_items:
-            if cmd.type == "node":
-                # Get icon if specified - default to sgtk icon if not specified.
-                icon = cmd.properties.get("icon", self._shotgun_logo)
-                command_context = cmd.properties.get("context")
-
-                # If the app recorded a context that it wants the command to be associated
-                # with, we need to check it against the current engine context. If they
-                # don't match then we don't add it.
-                if command_context is None or command_context is self.engine.context:
-                    node_menu_handle.addCommand(cmd.name, cmd.callback, icon=icon)
-            elif cmd.type == "context_menu":
-                cmd.add_command_to_menu(self._context_menu)
-            else:
-                # Normal menu.
-                app_name = cmd.app_name
-                if app_name is None:
-                    # Unparented app.
-                    app_name = "Other Items"
-                if not app_name in commands_by_app:
-                    commands_by_app[app_name] = []
-                commands_by_app[app_name].append(cmd)
-
-            # In addition to being added to the normal menu above,
-            # panel menu items are also added to the pane menu.
-            if cmd.type == "panel":
-                # First make sure the Shotgun pane menu exists.
-                pane_menu = nuke.menu("Pane").addMenu(
-                    "ShotGrid",
-                    icon=self._shotgun_logo,
-                )
-                # Now set up the callback.
-                cmd.add_command_to_pane_menu(pane_menu)
+        with self._build_phase("command_menus"):
+            for cmd in menu_items:
+                if cmd.type == "node":
+                    # Get icon if specified - default to sgtk icon if not specified.
+                    icon = cmd.properties.get("icon", self._shotgun_logo)
+                    command_context = cmd.properties.get("context")
+
+                    # If the app recorded a context that it wants the command to be associated
+                    # with, we need to check it against the current engine context. If they
+                    # don't match then we don't add it.
+                    if (
+                        command_context is None
+                        or command_context is self.engine.context
+                    ):
+                        node_menu_handle.addCommand(cmd.name, cmd.callback, icon=icon)
+                        self._build_stats["node_commands"] += 1
+                elif cmd.type == "context_menu":
+                    cmd.add_command_to_menu(self._context_menu)
+                    self._context_menu_commands.append(cmd)
+                else:
+                    # Normal menu.
+                    app_name = cmd.app_name
+                    if app_name is None:
+                        # Unparented app.
+                        app_name = "Other Items"
+                    if not app_name in commands_by_app:
+                        commands_by_app[app_name] = []
+                    commands_by_app[app_name].append(cmd)
+
+                # In addition to being added to the normal menu above,
+                # panel menu items are also added to the pane menu.
+                if cmd.type == "panel":
+                    # First make sure the Shotgun pane menu exists.
+                    pane_menu = nuke.menu("Pane").addMenu(
+                        "ShotGrid",
+                        icon=self._shotgun_logo,
+                    )
+                    # Now set up the callback.
+                    cmd.add_command_to_pane_menu(pane_menu)
+                    self._build_stats["pane_commands"] += 1
+        self._build_stats["context_menu_commands"] += len(self._context_menu_commands)
 
         # Now add all apps to main menu.
-        self._add_app_menu(commands_by_app, menu_handle)
+        with self._build_phase("app_menus"):
+            self._add_app_menu(commands_by_app, menu_handle)
 
     def create_disabled_menu(self, cmd_name, msg):
         """
@@ -670,20 +864,48 @@ class NukeMenuGenerator(BaseMenuGenerator):
                     # Clear it.
                     mh.clearMenu()
 
-    def _add_context_menu(self, menu_handle):
+    def refresh_context_menu(self):
+        """
+        Replaces the context menu with one for the engine's current context,
+        leaving the rest of the menu untouched.
+        """
+        # Menu handles can expire, so look the menus up rather than storing them.
+        menu_handle = nuke.menu("Nuke").findItem(self._menu_name)
+        old_ctx_menu = None
+        if menu_handle is not None and self._context_menu_name is not None:
+            old_ctx_menu = menu_handle.findItem(self._context_menu_name)
+        if old_ctx_menu is None:
+            self.create_menu()
+            return
+
+        old_ctx_menu.clearMenu()
+        menu_handle.removeItem(self._context_menu_name)
+
+        self._context_menu = self._add_context_menu(menu_handle, index=0)
+        for cmd in self._context_menu_commands:
+            cmd.add_command_to_menu(self._context_menu)
+
+    def _add_context_menu(self, menu_handle, index=None):
         """
         Adds a context menu which displays the current context.
 
         :param menu_handle: A handle to Nuke's top-level menu manager object.
+        :param int index:   Position to insert the menu at. The menu is added
+                            at the end if omitted.
         """
         ctx = self.engine.context
         ctx_name = str(ctx)
 
         # Create the menu object.
-        ctx_menu = menu_handle.addMenu(ctx_name, icon=self._shotgun_logo_blue)
+        kwargs = dict(icon=self._shotgun_logo_blue)
+        if index is not None:
+            kwargs["index"] = index
+        ctx_menu = menu_handle.addMenu(ctx_name, **kwargs)
+        self._context_menu_name = ctx_name
         ctx_menu.addCommand("Jump to ShotGrid", self._jump_to_sg)
         if ctx.filesystem_locations:
             ctx_menu.addCommand("Jump to File System", self._jump_to_fs)
+        ctx_menu.addCommand("Dump Recent Log Records", self._dump_log_records)
         ctx_menu.addSeparator()
         return ctx_menu
 
@@ -750,9 +972,9 @@ class BaseAppCommand(object):
             self._app_name = None
         self._app_instance_name = None
         if self._app:
-            for (app_instance_name, app_instance_obj) in engine.apps.items():
-                if self._app and self._app == app_instance_obj:
-                    self._app_instance_name = app_instance_name
+            self._app_instance_name = engine.command_index.get_app_instance_name(
+                self._app
+            )
 
     @property
     def app(self):
@@ -814,6 +1036,14 @@ class BaseAppCommand(object):
     def add_command_to_menu(self, menu, enabled=True, icon=None):
         raise NotImplementedError()
 
+    def _run_deferred_app_init(self):
+        """
+        Finishes initializing the command's app if the engine deferred part of
+        its initialization. See :meth:`NukeEngine.defer_app_init`.
+        """
+        if self._app:
+            self._engine.run_deferred_app_init(self._app)
+
     def add_command_to_pane_menu(self, menu):
         raise NotImplementedError()
 
@@ -956,6 +1186,7 @@ class HieroAppCommand(BaseAppCommand):
             self.engine.logger.debug("--------------------------------------------")
 
             # Fire the callback.
+            self._run_deferred_app_init()
             self.callback()
 
         action.triggered.connect(handler)
@@ -994,6 +1225,7 @@ class NukeAppCommand(BaseAppCommand):
         # object like this.
         setattr(sgtk, "_callback_from_non_pane_menu", True)
         try:
+            self._run_deferred_app_init()
             self._original_callback()
         finally:
             try:
@@ -1008,7 +1240,14 @@ class NukeAppCommand(BaseAppCommand):
         :param menu: The menu object to add the new item to.
         """
         icon = self.properties.get("icon")
-        menu.addCommand(self.name, self._original_callback, icon=icon)
+        menu.addCommand(self.name, self._pane_menu_callback_wrapper, icon=icon)
+
+    def _pane_menu_callback_wrapper(self):
+        """
+        Callback for pane menu commands.
+        """
+        self._run_deferred_app_init()
+        self._original_callback()
 
     def add_command_to_menu(self, menu, enabled=True, icon=None, hotkey=None):
         """
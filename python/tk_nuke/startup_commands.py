@@ -0,0 +1,114 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Scheduling of the commands run when the engine starts."""
+
+import time
+
+import sgtk
+
+logger = sgtk.LogManager.get_logger(__name__)
+
+
+class StartupCommandScheduler(object):
+    """
+    Runs the ``run_at_startup`` commands one at a time, each in its own idle
+    slot of the Qt event loop, so that Nuke can process events in between.
+
+    Commands run by decreasing priority, commands of equal priority running in
+    the order they were added. The time each command takes is recorded, and
+    commands taking longer than the budget are reported.
+    """
+
+    def __init__(self, budget=None):
+        """
+        :param float budget: Number of seconds a command is expected to run in.
+            Commands taking longer are reported with a warning. No budget is
+            enforced if omitted.
+        """
+        self._budget = budget
+        self._commands = []
+        self._durations = []
+
+    @property
+    def durations(self):
+        """
+        List of (command name, seconds) tuples for the commands that ran so far,
+        in the order they ran.
+        """
+        return list(self._durations)
+
+    def add_command(self, name, callback, priority=0):
+        """
+        Adds a command to run.
+
+        :param str name: Name of the command, used for reporting.
+        :param callback: Callable taking no arguments running the command.
+        :param int priority: Commands with a higher priority run first.
+        """
+        self._commands.append((priority, len(self._commands), name, callback))
+
+    def start(self):
+        """
+        Schedules the first command. The following ones are scheduled as each
+        command completes.
+        """
+        # Reverse the order so the next command to run can be popped off the end.
+        self._commands.sort(key=lambda command: (-command[0], command[1]), reverse=True)
+        self._schedule_next()
+
+    def _schedule_next(self):
+        """
+        Runs the next command once Nuke is idle.
+        """
+        if not self._commands:
+            return
+
+        from sgtk.platform.qt import QtCore
+
+        QtCore.QTimer.singleShot(0, self._run_next)
+
+    def _run_next(self):
+        """
+        Runs the next command and schedules the one after it.
+        """
+        if not self._commands:
+            return
+
+        _, _, name, callback = self._commands.pop()
+
+        # Set the _callback_from_non_pane_menu hint so that the show_panel method
+        # knows this was invoked not from the pane menu.
+        # FIXME: This pattern is horrible.
+        sgtk._callback_from_non_pane_menu = True
+        before = time.time()
+        try:
+            callback()
+        except Exception:
+            logger.exception("Startup command '%s' failed.", name)
+        finally:
+            duration = time.time() - before
+            try:
+                delattr(sgtk, "_callback_from_non_pane_menu")
+            except AttributeError:
+                pass
+
+        self._durations.append((name, duration))
+        if self._budget and duration > self._budget:
+            logger.warning(
+                "Startup command '%s' took %.2fs, which is over the %.2fs budget.",
+                name,
+                duration,
+                self._budget,
+            )
+        else:
+            logger.debug("Startup command '%s' took %.2fs.", name, duration)
+
+        self._schedule_next()
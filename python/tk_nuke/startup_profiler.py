@@ -0,0 +1,190 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""Timing instrumentation for the engine startup."""
+
+import contextlib
+import json
+import os
+import time
+
+import sgtk
+
+logger = sgtk.LogManager.get_logger(__name__)
+
+
+class StartupProfiler(object):
+    """
+    Records how long each phase of the engine startup takes.
+
+    Phases can be nested. Once the profiler is finished, the report is written
+    to disk as JSON and a one line summary of the top level phases is logged.
+    Phases postponed until after the startup are recorded through
+    :meth:`deferred_phase`. A disabled profiler records nothing, so it can be
+    used unconditionally.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        :param bool enabled: Whether phases should be recorded.
+        """
+        self._enabled = enabled
+        self._start_time = time.time()
+        self._end_time = None
+        self._report_path = None
+        # Finished phases, in the order they started.
+        self._phases = []
+        # Names of the phases currently running, outermost first.
+        self._running = []
+        # Phase dictionaries of running phases, keyed by name.
+        self._open_phases = {}
+
+    @property
+    def enabled(self):
+        """
+        Whether the profiler is recording phases.
+        """
+        return self._enabled and self._end_time is None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager timing the code it wraps as a phase of the startup.
+
+        :param str name: Name of the phase.
+        """
+        self.start_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    @contextlib.contextmanager
+    def deferred_phase(self, name):
+        """
+        Context manager timing a phase of the startup that was postponed until
+        Nuke was idle. Unlike :meth:`phase`, this records the phase after the
+        profiler is finished, logging its duration and updating the report.
+
+        :param str name: Name of the phase.
+        """
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            if self._enabled:
+                seconds = time.time() - start_time
+                self._phases.append(
+                    {
+                        "name": name,
+                        "parent": None,
+                        "start": start_time - self._start_time,
+                        "seconds": seconds,
+                        "deferred": True,
+                    }
+                )
+                logger.info("Deferred startup phase %s took %.3fs", name, seconds)
+                if self._end_time is not None:
+                    self._write_report()
+
+    def start_phase(self, name):
+        """
+        Starts timing a phase. Use this instead of :meth:`phase` for phases that
+        begin and end in different methods.
+
+        :param str name: Name of the phase.
+        """
+        if not self.enabled:
+            return
+
+        phase = {
+            "name": name,
+            "parent": self._running[-1] if self._running else None,
+            "start": time.time() - self._start_time,
+            "seconds": None,
+        }
+        self._phases.append(phase)
+        self._open_phases[name] = phase
+        self._running.append(name)
+
+    def end_phase(self, name):
+        """
+        Stops timing a phase. Phases that were never started are ignored.
+
+        :param str name: Name of the phase.
+        """
+        phase = self._open_phases.pop(name, None)
+        if phase is None:
+            return
+
+        phase["seconds"] = time.time() - self._start_time - phase["start"]
+        self._running.remove(name)
+
+    def get_report(self):
+        """
+        Builds the report of the phases recorded so far.
+
+        :returns: Dictionary with the total time of the startup and the list of
+            recorded phases. Phases that haven't ended have no duration.
+        """
+        end_time = self._end_time or time.time()
+        return {
+            "total_seconds": end_time - self._start_time,
+            "phases": [dict(phase) for phase in self._phases],
+        }
+
+    def get_summary(self):
+        """
+        :returns: One line summary of the time spent in each top level phase.
+        """
+        report = self.get_report()
+        phases = ", ".join(
+            "%s %.3fs" % (phase["name"], phase["seconds"])
+            for phase in report["phases"]
+            if phase["parent"] is None
+            and phase["seconds"] is not None
+            and not phase.get("deferred")
+        )
+        return "Engine startup took %.3fs (%s)" % (report["total_seconds"], phases)
+
+    def finish(self, report_path=None):
+        """
+        Stops recording, logs the summary and writes the report.
+
+        :param str report_path: Path of the JSON file to write the report to. The
+            report isn't written if omitted.
+        """
+        if not self.enabled:
+            return
+
+        self._end_time = time.time()
+        self._report_path = report_path
+        logger.info(self.get_summary())
+        self._write_report()
+
+    def _write_report(self):
+        """
+        Writes the report to the path given to :meth:`finish`, if any.
+        """
+        if not self._report_path:
+            return
+
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(
+                os.path.dirname(self._report_path)
+            )
+            with open(self._report_path, "w") as fh:
+                json.dump(self.get_report(), fh, indent=4)
+        except Exception:
+            logger.exception(
+                "Could not write the startup profile to %s", self._report_path
+            )
+        else:
+            logger.debug("Startup profile written to %s", self._report_path)
@@ -156,6 +156,9 @@ class ToolkitWidgetWrapper(QtGui.QWidget):
         kwargs = self._init_kwargs
         bundle = self._init_bundle
         self.nuke_panel = self._nuke_panel
+        self._delete_later_safe = (
+            sgtk.platform.current_engine().capabilities.delete_later_safe
+        )
 
         # and now clear the init parameters
         self.set_init_parameters(None, None, None, None, None, None)
@@ -306,7 +309,7 @@ class ToolkitWidgetWrapper(QtGui.QWidget):
         # close child widget
         self.toolkit_widget.close()
         # delete this widget and all children
-        if nuke.env.get("NukeVersionMajor") >= 11:
+        if not self._delete_later_safe:
             # We don't seem to be able to deleteLater safely in Nuke 11, which
             # is a PySide2/Qt5 app. My guess is that deleteLater is more "efficient"
             # than it was in Qt4, and as a result, the deleteLater actually seems
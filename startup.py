@@ -9,12 +9,31 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import sys
+import re
+import imp
+import glob
+import json
+import socket
+import string
 import sgtk
 import pprint
+from collections import OrderedDict
 
 from sgtk.platform import SoftwareLauncher, SoftwareVersion, LaunchInformation
 
 
+# The path helpers are shared with the legacy bootstrap and the engine. They are
+# loaded from their file location, under a name private to this engine, so that
+# a module of the same name elsewhere on sys.path can't shadow them.
+join_unique_paths = imp.load_source(
+    "tk_nuke_startup_nuke_env_paths",
+    os.path.join(os.path.dirname(__file__), "python", "startup", "nuke_env_paths.py"),
+).join_unique_paths
+
+logger = sgtk.LogManager.get_logger(__name__)
+
+
 class NukeLauncher(SoftwareLauncher):
     """
     Handles launching Nuke executables. Automatically starts up a tk-nuke
@@ -75,6 +94,27 @@ class NukeLauncher(SoftwareLauncher):
         ],
     }
 
+    # Compiled (glob pattern, regex) matchers for each executable template. They
+    # are built on first use and shared by all launchers in the process.
+    _TEMPLATE_MATCHERS = {}
+
+    # Joined plugin path environment variables, keyed by the variable name, its
+    # current value and the startup paths appended to it.
+    _JOINED_ENV_PATHS = {}
+
+    # Version of the on-disk software scan cache format. Bump this whenever the
+    # layout of the cached data changes so that older caches get discarded.
+    SCAN_CACHE_VERSION = 2
+
+    def __init__(self, *args, **kwargs):
+        super(NukeLauncher, self).__init__(*args, **kwargs)
+        # Memoized lookups used while building SoftwareVersions. See
+        # _get_icon_from_product and _get_product_table.
+        self._product_icons = {}
+        self._product_tables = {}
+        # Launch environment templates. See _get_launch_env_template.
+        self._launch_env_templates = {}
+
     def _get_icon_from_product(self, product):
         """
         Returns the icon based on the product.
@@ -83,14 +123,39 @@ class NukeLauncher(SoftwareLauncher):
 
         :returns: Path to the product's icon.
         """
-        if "studio" in product.lower():
-            return os.path.join(self.disk_location, "icon_nukestudio_256.png")
-        elif "hiero" in product.lower():
-            return os.path.join(self.disk_location, "icon_hiero_256.png")
-        elif "nukex" in product.lower():
-            return os.path.join(self.disk_location, "icon_x_256.png")
-        else:
-            return os.path.join(self.disk_location, "icon_256.png")
+        icon = self._product_icons.get(product)
+        if icon is None:
+            product_lower = product.lower()
+            if "studio" in product_lower:
+                icon_name = "icon_nukestudio_256.png"
+            elif "hiero" in product_lower:
+                icon_name = "icon_hiero_256.png"
+            elif "nukex" in product_lower:
+                icon_name = "icon_x_256.png"
+            else:
+                icon_name = "icon_256.png"
+            icon = os.path.join(self.disk_location, icon_name)
+            self._product_icons[product] = icon
+        return icon
+
+    def _get_arguments_from_product(self, product):
+        """
+        Returns the command line arguments required to launch a product from the
+        Nuke executable.
+
+        :param str product: Product name.
+
+        :returns: List of arguments.
+        """
+        if "Studio" in product:
+            return ["--studio"]
+        elif "Assist" in product:
+            return ["--nukeassist"]
+        elif "NukeX" in product:
+            return ["--nukex"]
+        elif "Hiero" in product:
+            return ["--hiero"]
+        return []
 
     def scan_software(self):
         """
@@ -98,45 +163,423 @@ class NukeLauncher(SoftwareLauncher):
 
         :returns: List of :class:`SoftwareVersion`.
         """
-        softwares = []
+        return list(self.iter_software())
+
+    def iter_software(self, versions=None, products=None):
+        """
+        Lazily scans for supported software, yielding each :class:`SoftwareVersion`
+        as soon as it is found. Callers that only need a single match, like the
+        first install of Nuke 13, can stop iterating early and skip the rest of
+        the scan.
+
+        Software is yielded in the order it is found on disk.
+
+        :param list versions: Optional versions to look for. A version matches when
+            it is equal to or more specific than one of these, e.g. ``"13"`` and
+            ``"13.0"`` both match ``"13.0v1"``. Install folders of other versions
+            are skipped before globbing for executables.
+        :param list products: Optional product names to look for, e.g. ``["NukeX"]``.
+
+        :returns: Generator of :class:`SoftwareVersion`.
+        """
         self.logger.debug("Scanning for Nuke-based software.")
-        for sw in self._find_software():
+        for sw in self._find_software(versions):
+            if products and sw.product not in products:
+                continue
+
             supported, reason = self._is_supported(sw)
             if supported:
-                softwares.append(sw)
+                yield sw
             else:
                 self.logger.debug(reason)
 
-        return softwares
-
-    def _find_software(self):
+    def _get_executable_templates(self):
         """
-        Finds all Nuke software on disk.
+        Returns the executable templates for the current OS.
 
-        :returns: Generator of :class:`SoftwareVersion`.
+        :returns: List of executable template strings.
         """
-
-        # Get all the executable templates for the current OS
-        executable_templates = self.EXECUTABLE_MATCH_TEMPLATES.get(
+        return self.EXECUTABLE_MATCH_TEMPLATES.get(
             "darwin"
             if sgtk.util.is_macos()
             else "win32"
             if sgtk.util.is_windows()
             else "linux2"
             if sgtk.util.is_linux()
-            else []
+            else None,
+            [],
         )
 
-        # Certain platforms have more than one location for installed software
-        for template in executable_templates:
-            self.logger.debug("Processing template %s.", template)
-            # Extract all products from that executable.
-            for executable, tokens in self._glob_and_match(
-                template, self.COMPONENT_REGEX_LOOKUP
+    def _find_software(self, versions=None):
+        """
+        Finds all Nuke software on disk.
+
+        :param list versions: Optional versions to restrict the search to. See
+            :meth:`iter_software`.
+
+        :returns: Generator of :class:`SoftwareVersion`.
+        """
+
+        # Get all the executable templates for the current OS
+        executable_templates = self._get_executable_templates()
+
+        scan_cache = self._load_scan_cache()
+        try:
+            # Install locations often live on different network mounts, so scanning
+            # them concurrently bounds the scan time by the slowest one.
+            if (
+                self.get_setting("parallel_software_scan", False)
+                and len(executable_templates) > 1
             ):
-                self.logger.debug("Processing %s with tokens %s", executable, tokens)
-                for sw in self._extract_products_from_path(executable, tokens):
-                    yield sw
+                scanned_templates = self._scan_templates_in_parallel(
+                    executable_templates, scan_cache, versions
+                )
+            else:
+                scanned_templates = {}
+
+            # Certain platforms have more than one location for installed software
+            for template in executable_templates:
+                self.logger.debug("Processing template %s.", template)
+                if template in scanned_templates:
+                    matches = scanned_templates[template]
+                else:
+                    matches = self._scan_template(template, scan_cache, versions)
+                # Extract all products from that executable.
+                for executable, tokens in matches:
+                    if versions and not self._version_matches(
+                        tokens.get("version"), versions
+                    ):
+                        continue
+                    self.logger.debug(
+                        "Processing %s with tokens %s", executable, tokens
+                    )
+                    for sw in self._extract_products_from_path(executable, tokens):
+                        yield sw
+        finally:
+            self._save_scan_cache(scan_cache)
+
+    def _scan_templates_in_parallel(self, templates, scan_cache, versions=None):
+        """
+        Scans multiple executable templates at once using a pool of threads.
+
+        :param list templates: Executable templates to scan for.
+        :param dict scan_cache: Scan cache, as returned by :meth:`_load_scan_cache`.
+        :param list versions: Optional versions to restrict the scan to.
+
+        :returns: Dictionary of template to list of (executable path, tokens) tuples.
+        """
+        # ThreadPool is used over concurrent.futures since it is available in
+        # Python 2 as well.
+        from multiprocessing.pool import ThreadPool
+
+        self.logger.debug("Scanning %d templates in parallel.", len(templates))
+        pool = ThreadPool(len(templates))
+        try:
+            results = pool.map(
+                lambda template: self._scan_template(template, scan_cache, versions),
+                templates,
+            )
+        finally:
+            pool.close()
+            pool.join()
+
+        return dict(zip(templates, results))
+
+    def _scan_template(self, template, scan_cache, versions=None):
+        """
+        Finds all the executables matching a template, reusing the results of
+        a previous scan when none of the install directories have changed since.
+
+        :param str template: Executable template to scan for.
+        :param dict scan_cache: Scan cache, as returned by :meth:`_load_scan_cache`.
+            The entry for the template is updated when a new full scan is required.
+        :param list versions: Optional versions to restrict the scan to. Only the
+            install folders of these versions are globbed when the cache can't be
+            used, and the partial results are not cached. The cached results are
+            returned unfiltered.
+
+        :returns: List of (executable path, tokens) tuples.
+        """
+        entry = scan_cache["templates"].get(template)
+        if entry is not None and self._is_scan_cache_entry_valid(template, entry):
+            self.logger.debug("Reusing cached scan results for %s.", template)
+            return entry["matches"]
+
+        if versions:
+            matches = []
+            found_paths = set()
+            for version in versions:
+                for executable, tokens in self._match_executables(template, version):
+                    if executable not in found_paths:
+                        found_paths.add(executable)
+                        matches.append((executable, tokens))
+            return matches
+
+        matches = self._match_executables(template)
+
+        scan_cache["templates"][template] = {
+            "mtimes": self._get_scan_mtimes(template),
+            "matches": matches,
+        }
+        scan_cache["modified"] = True
+        return matches
+
+    def _match_executables(self, template, version_prefix=""):
+        """
+        Globs for the executables matching a template and extracts the value of
+        each template token from their path.
+
+        This is equivalent to :meth:`_glob_and_match` with
+        :attr:`COMPONENT_REGEX_LOOKUP`, but reuses the compiled matcher for the
+        template across scans.
+
+        :param str template: Executable template to match.
+        :param str version_prefix: Optional prefix of the version folders to glob.
+
+        :returns: List of (executable path, tokens) tuples.
+        """
+        glob_template, regex = self._get_template_matcher(template)
+        glob_pattern = glob_template.format(version="%s*" % version_prefix)
+        self.logger.debug("Globbing for executables matching %s.", glob_pattern)
+
+        matches = []
+        for path in glob.glob(glob_pattern):
+            match = regex.match(path)
+            if match:
+                matches.append((path, match.groupdict()))
+            else:
+                self.logger.debug("Path %s did not match %s.", path, template)
+        return matches
+
+    @classmethod
+    def _get_template_matcher(cls, template):
+        """
+        Returns the glob template and compiled regular expression for a template.
+
+        :param str template: Executable template.
+
+        :returns: Tuple of the glob template and the compiled regular expression.
+        """
+        matcher = cls._TEMPLATE_MATCHERS.get(template)
+        if matcher is None:
+            matcher = cls._compile_template(template)
+            cls._TEMPLATE_MATCHERS[template] = matcher
+        return matcher
+
+    @classmethod
+    def _compile_template(cls, template):
+        """
+        Converts an executable template into a glob template and a regular expression
+        with a named group for each token of :attr:`COMPONENT_REGEX_LOOKUP`.
+
+        Every token is replaced with a wildcard in the glob template, except for
+        ``{version}``, which is left in place so that scans can be restricted to
+        specific versions.
+
+        The ``version_back`` token is matched as a back reference to ``version``,
+        since both are the same version of Nuke.
+
+        :param str template: Executable template.
+
+        :returns: Tuple of the glob template and the compiled regular expression.
+        """
+        glob_pattern = ""
+        regex_pattern = ""
+        tokens = set()
+        for literal, token, _, _ in string.Formatter().parse(template):
+            glob_pattern += literal
+            regex_pattern += re.escape(literal)
+            if token is None:
+                continue
+
+            if token == "version":
+                glob_pattern += "{version}"
+            elif not glob_pattern.endswith("*"):
+                # Consecutive tokens only need a single wildcard.
+                glob_pattern += "*"
+
+            if token == "version_back" and "version" in tokens:
+                regex_pattern += "(?P<version_back>(?P=version))"
+            else:
+                regex_pattern += "(?P<%s>%s)" % (
+                    token,
+                    cls.COMPONENT_REGEX_LOOKUP[token],
+                )
+            tokens.add(token)
+
+        return glob_pattern, re.compile("^%s$" % regex_pattern, re.IGNORECASE)
+
+    @classmethod
+    def _version_matches(cls, version, versions):
+        """
+        Checks if a version matches one of the requested versions.
+
+        :param str version: Version in the format <Major>.<Minor>v<Patch>
+        :param list versions: Requested versions, which can be partial, e.g. ``"13"``.
+
+        :returns: ``True`` if the version matches, ``False`` otherwise.
+        """
+        for requested in versions:
+            if (
+                version == requested
+                or version.startswith(requested + ".")
+                or version.startswith(requested + "v")
+            ):
+                return True
+        return False
+
+    def _get_scan_cache_path(self):
+        """
+        Returns the path to the software scan cache for this host.
+
+        The cache is stored per host since home directories, and therefore the
+        Toolkit cache location, are often shared between machines with different
+        software installed.
+
+        :returns: Path to the cache file.
+        """
+        cache_root = sgtk.util.LocalFileStorageManager.get_global_root(
+            sgtk.util.LocalFileStorageManager.CACHE
+        )
+        return os.path.join(
+            cache_root, "tk-nuke", "software_scan_%s.json" % socket.gethostname()
+        )
+
+    def _load_scan_cache(self):
+        """
+        Loads the software scan cache from disk.
+
+        A cache that is missing, unreadable or written in an older format is
+        treated as empty. The same goes when the ``force_software_rescan``
+        setting is turned on.
+
+        :returns: Dictionary with the cached scan results for each template.
+        """
+        scan_cache = {"templates": {}, "modified": False}
+
+        if self.get_setting("force_software_rescan", False):
+            self.logger.debug("Ignoring the software scan cache as requested.")
+            return scan_cache
+
+        cache_path = self._get_scan_cache_path()
+        if not os.path.exists(cache_path):
+            return scan_cache
+
+        try:
+            with open(cache_path, "r") as fh:
+                data = json.load(fh)
+        except Exception as e:
+            self.logger.debug(
+                "Unable to read software scan cache %s: %s", cache_path, e
+            )
+            return scan_cache
+
+        if data.get("version") == self.SCAN_CACHE_VERSION:
+            scan_cache["templates"] = data.get("templates", {})
+        return scan_cache
+
+    def _save_scan_cache(self, scan_cache):
+        """
+        Writes the software scan cache to disk if it was modified during the scan.
+
+        :param dict scan_cache: Scan cache, as returned by :meth:`_load_scan_cache`.
+        """
+        if not scan_cache["modified"]:
+            return
+
+        cache_path = self._get_scan_cache_path()
+        try:
+            sgtk.util.filesystem.ensure_folder_exists(os.path.dirname(cache_path))
+            with open(cache_path, "w") as fh:
+                json.dump(
+                    {
+                        "version": self.SCAN_CACHE_VERSION,
+                        "templates": scan_cache["templates"],
+                    },
+                    fh,
+                    separators=(",", ":"),
+                )
+        except Exception as e:
+            self.logger.debug(
+                "Unable to write software scan cache %s: %s", cache_path, e
+            )
+
+    @classmethod
+    def _get_template_root(cls, template):
+        """
+        Returns the deepest directory of a template that doesn't contain any
+        placeholders, e.g. ``/usr/local`` for ``/usr/local/Nuke{version}/...``.
+
+        :param str template: Executable template.
+
+        :returns: Path to the directory.
+        """
+        return os.path.dirname(template.split("{", 1)[0])
+
+    @classmethod
+    def _get_mtime(cls, path):
+        """
+        Returns the modification time of a path, or ``None`` if it doesn't exist.
+
+        :param str path: Path to stat.
+        """
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _get_scan_mtimes(self, template):
+        """
+        Returns the modification times of every directory that can affect the
+        results of globbing a template: the template's root directory and every
+        directory the glob walks through below it, e.g. each version folder.
+
+        Directories that don't contain an executable yet, like an install that
+        is still in progress, are recorded as well, so the cache is invalidated
+        once the executable shows up.
+
+        :param str template: Executable template that was scanned.
+
+        :returns: Dictionary of directory paths to modification times.
+        """
+        root = self._get_template_root(template)
+        mtimes = {root: self._get_mtime(root)}
+
+        # Glob patterns of the directory levels between the root and the
+        # executables, innermost first.
+        glob_template, _ = self._get_template_matcher(template)
+        levels = []
+        level = os.path.dirname(glob_template.format(version="*"))
+        while len(level) > len(root):
+            levels.append(level)
+            level = os.path.dirname(level)
+
+        for level in reversed(levels):
+            for directory in glob.glob(level):
+                if os.path.isdir(directory):
+                    mtimes[directory] = self._get_mtime(directory)
+        return mtimes
+
+    def _is_scan_cache_entry_valid(self, template, entry):
+        """
+        Checks that none of the directories recorded for a cached scan changed.
+
+        The template's root directory is allowed to be missing, in which case the
+        cached result is simply that nothing is installed there. Every other
+        directory needs to exist.
+
+        :param str template: Executable template the entry was cached for.
+        :param dict entry: Cached scan results for the template.
+
+        :returns: ``True`` if the cached results can be reused, ``False`` otherwise.
+        """
+        root = self._get_template_root(template)
+        for directory, mtime in entry["mtimes"].items():
+            if mtime is None and directory != root:
+                return False
+            if self._get_mtime(directory) != mtime:
+                return False
+        return True
 
     def _extract_products_from_path(self, executable_path, match):
         """
@@ -169,24 +612,14 @@ class NukeLauncher(SoftwareLauncher):
                 self._get_icon_from_product(executable_product),
             )
         else:
-            for product in self._get_products_from_version(executable_version):
-                # Figure out the arguments required for each product.
-                arguments = []
-                if "Studio" in product:
-                    arguments.append("--studio")
-                elif "Assist" in product:
-                    arguments.append("--nukeassist")
-                elif "NukeX" in product:
-                    arguments.append("--nukex")
-                elif "Hiero" in product:
-                    arguments.append("--hiero")
-
+            product_table = self._get_product_table(executable_version)
+            for product, (arguments, icon) in product_table.items():
                 sw = SoftwareVersion(
                     executable_version,
                     product,
                     executable_path,
-                    self._get_icon_from_product(product),
-                    arguments,
+                    icon,
+                    list(arguments),
                 )
                 yield sw
 
@@ -205,6 +638,40 @@ class NukeLauncher(SoftwareLauncher):
         else:
             return self.NUKE_9_OR_HIGHER_PRODUCTS
 
+    def _get_product_table(self, version):
+        """
+        Get the products for a given Nuke version, along with the arguments and
+        icon required to launch each of them.
+
+        Tables are built once per major version and then memoized for each
+        version string, so that scanning many installs doesn't repeat the work.
+
+        :param str version: Nuke version in the format <Major>.<Minor>v<Patch>
+
+        :returns: Ordered dictionary of product name to (arguments, icon) tuples.
+        """
+        product_table = self._product_tables.get(version)
+        if product_table is None:
+            # Tables are shared by all versions with the same major version. Major
+            # versions can't collide with full version strings since those always
+            # contain a dot.
+            major_version = version.split(".", 1)[0]
+            product_table = self._product_tables.get(major_version)
+            if product_table is None:
+                product_table = OrderedDict(
+                    (
+                        product,
+                        (
+                            tuple(self._get_arguments_from_product(product)),
+                            self._get_icon_from_product(product),
+                        ),
+                    )
+                    for product in self._get_products_from_version(major_version)
+                )
+                self._product_tables[major_version] = product_table
+            self._product_tables[version] = product_table
+        return product_table
+
     def _is_supported(self, version):
         """
         Ensures that a product is supported by the launcher and that the version is valid.
@@ -214,7 +681,7 @@ class NukeLauncher(SoftwareLauncher):
 
         :returns: ``True`` if supported, ``False`` if not.
         """
-        if version.product not in self._get_products_from_version(version.version):
+        if version.product not in self._get_product_table(version.version):
             return False, "Toolkit does not support '%s'." % version.product
 
         return super(NukeLauncher, self)._is_supported(version)
@@ -239,38 +706,93 @@ class NukeLauncher(SoftwareLauncher):
 
         :returns: :class:`LaunchInformation` instance
         """
+        return self.prepare_launches([(exec_path, args, file_to_open)])[0]
+
+    def prepare_launches(self, launch_requests):
+        """
+        Prepares many launches at once, e.g. when submitting tasks to a render farm.
+
+        Plugin path resolution, the joining of the DCC's plugin path variable and
+        the context serialization all happen once for the whole batch.
+
+        :param list launch_requests: List of (exec_path, args, file_to_open) tuples,
+            as passed to :meth:`prepare_launch`.
+
+        :returns: List of :class:`LaunchInformation` instances, in the same order
+            as the requests.
+        """
+        startup_paths, template_env = self._get_launch_env_template()
+
+        # Formatting the environment is expensive, so only do it when it is
+        # actually going to be logged. Toolkit loggers let debug messages
+        # through and leave the filtering to the handlers, so the logger can't
+        # be asked whether debug logging is on.
+        log_launches = sgtk.LogManager().global_debug or self.get_setting(
+            "debug_logging", False
+        )
+
+        launches = []
+        for exec_path, args, file_to_open in launch_requests:
+            # Only the plugin path and arguments depend on what is being launched.
+            required_env, required_args = self._compute_environment(
+                exec_path, args, startup_paths, file_to_open
+            )
+            required_env.update(template_env)
+
+            if log_launches:
+                self.logger.debug(
+                    "Launch environment: %s", pprint.pformat(required_env)
+                )
+                self.logger.debug("Launch arguments: %s", required_args)
+
+            launches.append(LaunchInformation(exec_path, required_args, required_env))
+
+        return launches
+
+    def _get_launch_env_template(self):
+        """
+        Returns the parts of the launch environment that are the same for every
+        launch: the startup paths to add to the DCC's plugin path and the
+        environment variables used to bootstrap Toolkit.
+
+        Templates are computed once per engine and list of builtin plugins. The
+        context is part of the launcher, so it can't change between launches.
+
+        :returns: Tuple of the list of startup paths and the dictionary of
+            environment variables. Neither should be modified.
+        """
         launch_plugins = self.get_setting("launch_builtin_plugins")
+        key = (self.engine_name, tuple(launch_plugins or []))
+        template = self._launch_env_templates.get(key)
+        if template is not None:
+            return template
 
         if launch_plugins:
             self.logger.debug("Launch plugins: %s", launch_plugins)
 
-            # Get Nuke environment for plugin launch.
-            required_env, required_args = self._get_plugin_startup_env(
-                launch_plugins, exec_path, args, file_to_open
-            )
+            startup_paths = self._get_plugin_startup_paths(launch_plugins)
 
             # Add std context and site info to the env.
-            required_env.update(self.get_standard_plugin_environment())
+            template_env = self.get_standard_plugin_environment()
 
             # Make sure we are picking the right engine.
-            required_env["SHOTGUN_ENGINE"] = self.engine_name
+            template_env["SHOTGUN_ENGINE"] = self.engine_name
         else:
             self.logger.debug(
                 "Preparing Nuke Launch via Toolkit Classic methodology ..."
             )
 
-            # Get Nuke environment for Toolkit Classic launch.
-            required_env, required_args = self._get_classic_startup_env(
-                self.disk_location, exec_path, args, file_to_open
-            )
-            # Add context information info to the env.
-            required_env["TANK_CONTEXT"] = sgtk.Context.serialize(self.context)
-            required_env["TANK_ENGINE"] = self.engine_name
+            startup_paths = [os.path.join(self.disk_location, "classic_startup")]
 
-        self.logger.debug("Launch environment: %s", pprint.pformat(required_env))
-        self.logger.debug("Launch arguments: %s", required_args)
+            # Add context information info to the env.
+            template_env = {
+                "TANK_CONTEXT": sgtk.Context.serialize(self.context),
+                "TANK_ENGINE": self.engine_name,
+            }
 
-        return LaunchInformation(exec_path, required_args, required_env)
+        template = (startup_paths, template_env)
+        self._launch_env_templates[key] = template
+        return template
 
     # Do not remove or rename this method. It is being called by older versions
     # of the tk-multi-launchapp from tk-nuke/python/startup/bootstrap.py.
@@ -310,6 +832,22 @@ class NukeLauncher(SoftwareLauncher):
         :returns: Dictionary of environment variables to set and the command line arguments
             to specify.
         """
+        return self._compute_environment(
+            app_path,
+            app_args,
+            self._get_plugin_startup_paths(plugin_names),
+            file_to_open,
+        )
+
+    def _get_plugin_startup_paths(self, plugin_names):
+        """
+        Resolves the paths to the builtin plugins to load. Missing plugins are
+        skipped.
+
+        :param str plugin_names: Names of the builtin plugins to load.
+
+        :returns: List of paths to the plugins.
+        """
         startup_paths = []
 
         for plugin_name in plugin_names:
@@ -323,9 +861,7 @@ class NukeLauncher(SoftwareLauncher):
                     "Plugin '%s' missing at '%s'", plugin_name, plugin_path
                 )
 
-        return self._compute_environment(
-            app_path, app_args, startup_paths, file_to_open
-        )
+        return startup_paths
 
     @classmethod
     def _join_paths_with_existing_env_paths(cls, env_key, startup_paths):
@@ -340,13 +876,27 @@ class NukeLauncher(SoftwareLauncher):
         """
         # get any existing nuke path to custom gizmos, scripts etc.
         existing_path_str = os.environ.get(env_key, "")
+
+        # The result only depends on the current value of the variable and the
+        # startup paths, so reuse it across launches.
+        key = (env_key, existing_path_str, tuple(startup_paths))
+        joined_path_str = cls._JOINED_ENV_PATHS.get(key)
+        if joined_path_str is not None:
+            return joined_path_str
+
         existing_path_list = existing_path_str.split(os.pathsep)
 
         # append the toolkit extensions in order to ensure the right integrations execute
         new_path_list = existing_path_list + startup_paths
 
-        # now filter out any empty strings/paths and join the remainder back together with separators
-        return os.pathsep.join(filter(None, new_path_list))
+        # now filter out any empty or duplicate paths and join the remainder back
+        # together with separators. Nuke re-launching itself on File->Open would
+        # otherwise keep growing the variable.
+        joined_path_str, removed = join_unique_paths(new_path_list)
+        if removed:
+            logger.debug("Removed %d duplicate entries from %s.", removed, env_key)
+        cls._JOINED_ENV_PATHS[key] = joined_path_str
+        return joined_path_str
 
     @classmethod
     def _compute_environment(cls, app_path, app_args, startup_paths, file_to_open):
@@ -0,0 +1,67 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Creation of fake Nuke installs on disk, shared by the launcher tests.
+"""
+
+import os
+
+import sgtk
+
+# Executable templates for each OS layout, relative to the install root.
+LAYOUT_TEMPLATES = {
+    "darwin": os.path.join("Nuke{version}", "{product}{version_back}.app"),
+    "win32": os.path.join("Nuke{version}", "Nuke{major_minor_version}.exe"),
+    "linux2": os.path.join("Nuke{version}", "Nuke{major_minor_version}"),
+}
+
+
+def get_current_layout():
+    """
+    :returns: Name of the OS layout of the current OS.
+    """
+    if sgtk.util.is_macos():
+        return "darwin"
+    elif sgtk.util.is_windows():
+        return "win32"
+    return "linux2"
+
+
+def create_fake_installs(root, versions, layout=None, products=("Nuke",)):
+    """
+    Creates fake Nuke installs on disk.
+
+    :param str root: Folder to create the installs in.
+    :param list versions: Versions of Nuke to create installs for.
+    :param str layout: OS layout to use for the installs. Defaults to the
+        layout of the current OS.
+    :param products: Products to create an application bundle for in each
+        install. Only used by the macOS layout.
+
+    :returns: Executable template matching the installs.
+    """
+    layout = layout or get_current_layout()
+
+    for version in versions:
+        install_folder = os.path.join(root, "Nuke%s" % version)
+        os.makedirs(install_folder)
+        if layout == "darwin":
+            for product in products:
+                os.makedirs(
+                    os.path.join(install_folder, "%s%s.app" % (product, version))
+                )
+        else:
+            executable = "Nuke%s" % version.split("v")[0]
+            if layout == "win32":
+                executable += ".exe"
+            open(os.path.join(install_folder, executable), "w").close()
+
+    return os.path.join(root, LAYOUT_TEMPLATES[layout])
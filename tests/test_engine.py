@@ -0,0 +1,211 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from __future__ import with_statement
+from __future__ import print_function
+import os
+import sys
+import types
+import logging
+from collections import OrderedDict
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+import mock
+
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+print("tk-nuke repository root found at %s." % repo_root)
+
+
+class DeferringApp(object):
+    """
+    App deferring the creation of its panel's resources through the engine.
+    """
+
+    def __init__(self, engine, instance_name):
+        self.instance_name = instance_name
+        self.initialized = False
+        engine.defer_app_init(self, self._finish_init)
+
+    def _finish_init(self):
+        self.initialized = True
+
+    def create_panel(self):
+        """
+        Panel callback, reporting whether the app was initialized beforehand.
+        """
+        return self.initialized
+
+
+class TestDeferredAppInit(TankTestBase):
+    """
+    Tests the deferred initialization of apps.
+    """
+
+    def setUp(self):
+        """
+        Makes the engine importable outside of Nuke.
+        """
+        super(TestDeferredAppInit, self).setUp()
+
+        nuke = types.ModuleType("nuke")
+        nuke.env = {"gui": True}
+        nukescripts = types.ModuleType("nukescripts")
+        nukescripts.panels = types.ModuleType("nukescripts.panels")
+        nukescripts.panels.registerPanel = mock.Mock()
+        self._register_panel = nukescripts.panels.registerPanel
+
+        # Restoring sys.modules also unloads the engine, which was imported
+        # against the fake modules.
+        patch = mock.patch.dict(
+            "sys.modules",
+            {
+                "nuke": nuke,
+                "nukescripts": nukescripts,
+                "nukescripts.panels": nukescripts.panels,
+            },
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        patch = mock.patch.object(sys, "path", [repo_root] + sys.path)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        import engine
+
+        self.engine = self._create_engine(engine.NukeEngine)
+
+    def _create_engine(self, engine_class, lazy_app_init=True):
+        """
+        Creates an engine without going through the Toolkit startup.
+        """
+        engine = engine_class.__new__(engine_class)
+        engine._ui_enabled = True
+        engine._deferred_app_inits = OrderedDict()
+        engine._deferred_app_init_scheduled = False
+        engine.get_setting = lambda name, default=None: {
+            "lazy_app_init": lazy_app_init
+        }.get(name, default)
+
+        self._apps = {}
+        self._panels = {}
+        for (name, value) in (
+            ("logger", logging.getLogger("test_engine")),
+            ("apps", self._apps),
+            ("panels", self._panels),
+        ):
+            patch = mock.patch.object(
+                engine_class, name, new_callable=mock.PropertyMock, return_value=value
+            )
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        return engine
+
+    def _add_app(self, instance_name):
+        app = DeferringApp(self.engine, instance_name)
+        self._apps[instance_name] = app
+        return app
+
+    def _mock_idle_timer(self):
+        """
+        Records the callbacks scheduled to run when Nuke is idle.
+
+        :returns: List the scheduled callbacks are appended to.
+        """
+        scheduled = []
+        qt = types.ModuleType("qt")
+        qt.QtCore = mock.Mock()
+        qt.QtCore.QTimer.singleShot.side_effect = lambda delay, callback: (
+            scheduled.append(callback)
+        )
+        patch = mock.patch.object(sgtk.platform, "qt", qt, create=True)
+        patch.start()
+        self.addCleanup(patch.stop)
+        return scheduled
+
+    def _get_registered_panels(self):
+        return dict(call[0] for call in self._register_panel.call_args_list)
+
+    def test_defer_app_init(self):
+        """
+        Makes sure initialization is only deferred when lazy_app_init is on.
+        """
+        app = self._add_app("tk-multi-deferring")
+        self.assertFalse(app.initialized)
+
+        self.engine.run_deferred_app_init(app)
+        self.assertTrue(app.initialized)
+
+        self.engine = self._create_engine(type(self.engine), lazy_app_init=False)
+        self.assertTrue(self._add_app("tk-multi-eager").initialized)
+
+    def test_panel_callbacks(self):
+        """
+        Makes sure restoring a panel finishes initializing its app first, and
+        only that app.
+        """
+        app = self._add_app("tk-multi-deferring")
+        other_app = self._add_app("tk-multi-other")
+        self._panels["tk_multi_deferring_panel"] = {
+            "callback": app.create_panel,
+            "properties": {},
+        }
+
+        self.engine._register_panels()
+        panels = self._get_registered_panels()
+
+        self.assertTrue(panels["tk_multi_deferring_panel"]())
+        self.assertFalse(other_app.initialized)
+
+    def test_panel_callbacks_without_app(self):
+        """
+        Makes sure all apps are initialized when restoring a panel whose app
+        can't be told.
+        """
+        app = self._add_app("tk-multi-deferring")
+        self._panels["tk_multi_function_panel"] = {
+            "callback": lambda: app.initialized,
+            "properties": {},
+        }
+
+        self.engine._register_panels()
+        panels = self._get_registered_panels()
+
+        self.assertTrue(panels["tk_multi_function_panel"]())
+
+    def test_context_change(self):
+        """
+        Makes sure the deferred initialization of apps torn down by a context
+        change is dropped, and that the apps created by the switch are
+        initialized once Nuke is idle.
+        """
+        scheduled = self._mock_idle_timer()
+        old_app = self._add_app("tk-multi-deferring")
+
+        # The switch replaces the app with a new instance of the same name.
+        new_app = self._add_app("tk-multi-deferring")
+        with mock.patch.object(
+            self.engine, "_is_warm_context_switch"
+        ), mock.patch.object(self.engine, "_warm_context_change"):
+            self.engine._context_switch_start = None
+            self.engine.post_context_change(None, None)
+
+        self.assertEqual(len(scheduled), 1)
+        scheduled.pop()()
+
+        self.assertTrue(new_app.initialized)
+        self.assertFalse(old_app.initialized)
+        self.assertEqual(scheduled, [])
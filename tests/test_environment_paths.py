@@ -76,10 +76,11 @@ class TestEnvironmentPaths(TankTestBase):
                 "/path/to/nuke", ["arg1", "arg2"], None
             )
 
-            # ensure that the nuke path was preserved and placed first in the path
+            # ensure that the nuke path was preserved and placed first in the path,
+            # and that the duplicate entry was removed
             self.assertEqual(
                 launch_info.environment["NUKE_PATH"],
-                os.pathsep.join([nuke_path_1, nuke_path_2, plugin_path]),
+                os.pathsep.join([nuke_path_1, plugin_path]),
             )
 
         # now test without stuff in the nuke path
@@ -119,10 +120,11 @@ class TestEnvironmentPaths(TankTestBase):
                 "/path/to/nuke", ["--hiero"], None
             )
 
-            # ensure that the hiero path was preserved and placed first in the path
+            # ensure that the hiero path was preserved and placed first in the path,
+            # and that the duplicate entry was removed
             self.assertEqual(
                 launch_info.environment["HIERO_PLUGIN_PATH"],
-                os.pathsep.join([hiero_path_1, hiero_path_2, plugin_path]),
+                os.pathsep.join([hiero_path_1, plugin_path]),
             )
 
         # now test without stuff in the Hiero path
@@ -160,10 +162,11 @@ class TestEnvironmentPaths(TankTestBase):
                 "/path/to/nuke", ["--studio"], None
             )
 
-            # ensure that the nuke studio path was preserved and placed first in the path
+            # ensure that the nuke studio path was preserved and placed first in the path,
+            # and that the duplicate entry was removed
             self.assertEqual(
                 launch_info.environment["HIERO_PLUGIN_PATH"],
-                os.pathsep.join([hiero_path_1, hiero_path_2, plugin_path]),
+                os.pathsep.join([hiero_path_1, plugin_path]),
             )
 
         # now test without stuff in the heiro path
@@ -173,3 +176,36 @@ class TestEnvironmentPaths(TankTestBase):
 
         # ensure that the nuke studio path was preserved and placed first in the path
         self.assertEqual(launch_info.environment["HIERO_PLUGIN_PATH"], plugin_path)
+
+    def test_duplicate_paths_removed(self):
+        """
+        Tests that equivalent paths are only kept once, in their original order.
+        """
+        gizmo_path = os.path.join(tempfile.gettempdir(), "gizmo_1")
+        other_path = os.path.join(tempfile.gettempdir(), "gizmo_2")
+        plugin_path = os.path.join(repo_root, "plugins", "basic")
+
+        nuke_path_env = {
+            "NUKE_PATH": os.pathsep.join(
+                [
+                    gizmo_path,
+                    "",
+                    other_path,
+                    gizmo_path + os.path.sep,
+                    os.path.join(tempfile.gettempdir(), ".", "gizmo_1"),
+                    plugin_path,
+                ]
+            )
+        }
+        with temp_env_var(**nuke_path_env):
+            nuke_launcher = sgtk.platform.create_engine_launcher(
+                self.tk, sgtk.context.create_empty(self.tk), "tk-nuke", ["10.0v5"]
+            )
+            launch_info = nuke_launcher.prepare_launch(
+                "/path/to/nuke", ["arg1", "arg2"], None
+            )
+
+            self.assertEqual(
+                launch_info.environment["NUKE_PATH"],
+                os.pathsep.join([gizmo_path, other_path, plugin_path]),
+            )
@@ -0,0 +1,278 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from __future__ import with_statement
+from __future__ import print_function
+import os
+import sys
+import types
+import logging
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import mock
+
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+print("tk-nuke repository root found at %s." % repo_root)
+
+
+class FakeMenu(object):
+    """
+    Minimal stand-in for nuke.Menu, recording what is added to it.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._items = []
+
+    def name(self):
+        return self._name
+
+    def items(self):
+        return list(self._items)
+
+    def findItem(self, name):
+        for item in self._items:
+            if isinstance(item, FakeMenu) and item.name() == name:
+                return item
+        return None
+
+    def addMenu(self, name, **kwargs):
+        menu = self.findItem(name)
+        if menu is None:
+            menu = FakeMenu(name)
+            self._items.append(menu)
+        return menu
+
+    def addCommand(self, name, *args, **kwargs):
+        self._items.append(name)
+
+    def addSeparator(self):
+        self._items.append("-")
+
+    def clearMenu(self):
+        self._items = []
+
+    def removeItem(self, name):
+        self._items.remove(self.findItem(name))
+
+
+class FakeContext(str):
+    """
+    Context whose string representation is used as the context menu name.
+    """
+
+    filesystem_locations = []
+
+
+class CountingIndex(dict):
+    """
+    Menu item index counting the lookups done through it.
+    """
+
+    lookups = 0
+
+    def get(self, *args, **kwargs):
+        self.lookups += 1
+        return super(CountingIndex, self).get(*args, **kwargs)
+
+
+class FakeApp(object):
+    def __init__(self, instance_name):
+        self.instance_name = instance_name
+        self.display_name = instance_name.title()
+
+
+class TestMenuGeneration(TankTestBase):
+    """
+    Tests the resolution of favourites when building the Nuke menu.
+    """
+
+    # Size of the synthetic configuration.
+    APP_COUNT = 50
+    COMMAND_COUNT = 500
+    FAVOURITE_COUNT = 100
+
+    def setUp(self):
+        """
+        Makes tk_nuke importable outside of Nuke.
+        """
+        super(TestMenuGeneration, self).setUp()
+
+        self._menus = {}
+        nuke = types.ModuleType("nuke")
+        nuke.env = {"gui": True}
+        nuke.Menu = FakeMenu
+        nuke.menu = lambda name: self._menus.setdefault(name, FakeMenu(name))
+        nukescripts = types.ModuleType("nukescripts")
+        nukescripts.openurl = types.ModuleType("nukescripts.openurl")
+
+        # Restoring sys.modules also unloads tk_nuke, which was imported
+        # against the fake modules.
+        patch = mock.patch.dict(
+            "sys.modules",
+            {
+                "nuke": nuke,
+                "nukescripts": nukescripts,
+                "nukescripts.openurl": nukescripts.openurl,
+            },
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        patch = mock.patch.object(
+            sys, "path", [os.path.join(repo_root, "python")] + sys.path
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        import tk_nuke
+
+        self.tk_nuke = tk_nuke
+        self.engine = self._create_engine()
+
+    def _create_engine(self):
+        """
+        Creates an engine-like object with many commands and favourites.
+        """
+        apps = dict(
+            ("app_%02d" % i, FakeApp("app_%02d" % i)) for i in range(self.APP_COUNT)
+        )
+        commands = {}
+        for i in range(self.COMMAND_COUNT):
+            app = apps["app_%02d" % (i % self.APP_COUNT)]
+            commands["Command %03d" % i] = {
+                "properties": {"app": app},
+                "callback": lambda: None,
+            }
+
+        # Spread the favourites over the commands, and add one that doesn't
+        # match any command.
+        step = self.COMMAND_COUNT // self.FAVOURITE_COUNT
+        favourites = [
+            {
+                "app_instance": "app_%02d" % (i % self.APP_COUNT),
+                "name": "Command %03d" % i,
+            }
+            for i in range(0, self.COMMAND_COUNT, step)
+        ][: self.FAVOURITE_COUNT - 1]
+        favourites.append({"app_instance": "app_00", "name": "Missing Command"})
+        settings = {"menu_favourites": favourites}
+
+        engine = mock.Mock()
+        engine.disk_location = repo_root
+        engine.logger = logging.getLogger("test_menu_generation")
+        engine.context = FakeContext("Shot ABC_123")
+        engine.commands = commands
+        engine.command_index = self.tk_nuke.CommandIndex(commands, apps)
+        engine.get_setting.side_effect = lambda name, default=None: settings.get(
+            name, default
+        )
+        return engine
+
+    def _resolve_favourites_naively(self, menu_items):
+        """
+        Resolves the favourites by scanning all menu items for each of them,
+        the way menus used to be built.
+        """
+        matches = []
+        for fav in self.engine.get_setting("menu_favourites"):
+            for cmd in menu_items:
+                if cmd.app_instance_name == fav["app_instance"] and (
+                    cmd.name == fav["name"]
+                ):
+                    matches.append(cmd)
+        return matches
+
+    def _resolve_favourites(self, generator, menu_items):
+        """
+        Resolves the favourites through the index the menu generators use.
+        """
+        index = generator._index_menu_items(menu_items)
+        matches = []
+        for fav in self.engine.get_setting("menu_favourites"):
+            for (_, cmd) in index.get((fav["app_instance"], fav["name"]), []):
+                matches.append(cmd)
+        return matches
+
+    def test_favourites(self):
+        """
+        Makes sure all favourites end up at the top of the menu.
+        """
+        generator = self.tk_nuke.NukeMenuGenerator(self.engine, "ShotGrid")
+        generator.create_menu()
+
+        stats = generator.build_stats
+        self.assertEqual(stats["commands"], self.COMMAND_COUNT)
+        self.assertEqual(stats["favourites"], self.FAVOURITE_COUNT - 1)
+
+        # The context menu, a separator, then the favourites.
+        items = self._menus["Nuke"].findItem("ShotGrid").items()
+        expected = [
+            fav["name"]
+            for fav in self.engine.get_setting("menu_favourites")
+            if fav["name"] in self.engine.commands
+        ]
+        self.assertEqual(items[2 : 2 + len(expected)], expected)
+
+    def test_index(self):
+        """
+        Makes sure the index keeps every menu item with a given key, in order.
+        """
+        generator = self.tk_nuke.NukeMenuGenerator(self.engine, "ShotGrid")
+        app = FakeApp("app_00")
+        self.engine.command_index = self.tk_nuke.CommandIndex({}, {"app_00": app})
+        menu_items = [
+            self.tk_nuke.menu_generation.NukeAppCommand(
+                self.engine, name, {"properties": {"app": app}, "callback": None}
+            )
+            for name in ("first", "second", "first")
+        ]
+
+        index = generator._index_menu_items(menu_items)
+        self.assertEqual(
+            index[("app_00", "first")],
+            [(0, menu_items[0]), (2, menu_items[2])],
+        )
+        self.assertEqual(index[("app_00", "second")], [(1, menu_items[1])])
+        self.assertNotIn(("app_01", "first"), index)
+
+    def test_resolution(self):
+        """
+        Makes sure the indexed resolution of favourites matches the naive one,
+        and that building the menu does a single lookup per favourite.
+        """
+        generator = self.tk_nuke.NukeMenuGenerator(self.engine, "ShotGrid")
+        menu_items = [
+            self.tk_nuke.menu_generation.NukeAppCommand(self.engine, name, details)
+            for (name, details) in self.engine.commands.items()
+        ]
+        self.assertEqual(
+            self._resolve_favourites(generator, menu_items),
+            self._resolve_favourites_naively(menu_items),
+        )
+
+        indexes = []
+        original_index_menu_items = generator._index_menu_items
+
+        def index_menu_items(menu_items):
+            index = CountingIndex(original_index_menu_items(menu_items))
+            indexes.append(index)
+            return index
+
+        with mock.patch.object(
+            generator, "_index_menu_items", side_effect=index_menu_items
+        ):
+            generator.create_menu()
+
+        self.assertEqual(len(indexes), 1)
+        self.assertEqual(indexes[0].lookups, self.FAVOURITE_COUNT)
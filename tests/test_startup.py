@@ -17,10 +17,14 @@ from tank_test.tank_test_base import TankTestBase
 from tank_test.tank_test_base import setUpModule  # noqa
 from tank_vendor import six
 
+from fake_installs import create_fake_installs
+
 import sgtk
 
 import mock
 import contextlib
+import shutil
+import tempfile
 
 
 repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -126,6 +130,30 @@ class TestStartup(TankTestBase):
         # repo.
         self.setup_fixtures()
 
+        # Give each launcher its own software scan cache, so that results cached
+        # by a previous test or launcher are never used in place of a scan.
+        create_engine_launcher = sgtk.platform.create_engine_launcher
+
+        def create_isolated_engine_launcher(*args, **kwargs):
+            launcher = create_engine_launcher(*args, **kwargs)
+            cache_path = os.path.join(
+                tempfile.mkdtemp(dir=self.tank_temp), "software_scan.json"
+            )
+            patch = mock.patch.object(
+                launcher, "_get_scan_cache_path", return_value=cache_path
+            )
+            self.addCleanup(patch.stop)
+            patch.start()
+            return launcher
+
+        patch = mock.patch.object(
+            sgtk.platform,
+            "create_engine_launcher",
+            side_effect=create_isolated_engine_launcher,
+        )
+        self.addCleanup(patch.stop)
+        patch.start()
+
         # Update the mocked hierarchy to contain the user folder on Linux.
         if sgtk.util.is_linux():
             full_path = os.path.expanduser("~")
@@ -245,6 +273,42 @@ class TestStartup(TankTestBase):
         """
         self._test_nuke([], "6.3v6")
 
+    def test_parallel_scan(self):
+        """
+        Ensures scanning install locations in parallel finds the same software,
+        in the same order, as scanning them one after the other.
+        """
+        scans = []
+        for engine_instance in ["tk-nuke", "tk-nuke-parallel"]:
+            nuke_launcher = sgtk.platform.create_engine_launcher(
+                self.tk, sgtk.context.create_empty(self.tk), engine_instance
+            )
+            with self._mock_folder_listing():
+                scans.append(
+                    [(sw.display_name, sw.path) for sw in nuke_launcher.scan_software()]
+                )
+
+        self.assertNotEqual(scans[0], [])
+        self.assertEqual(scans[0], scans[1])
+
+    def test_iter_software(self):
+        """
+        Ensures software can be scanned lazily for specific versions and products.
+        """
+        nuke_launcher = sgtk.platform.create_engine_launcher(
+            self.tk, sgtk.context.create_empty(self.tk), "tk-nuke"
+        )
+
+        with self._mock_folder_listing():
+            software = nuke_launcher.iter_software(versions=["10"], products=["NukeX"])
+            self.assertEqual(next(software).display_name, "NukeX 10.0v5")
+            software.close()
+
+            self.assertEqual(
+                set(sw.version for sw in nuke_launcher.iter_software(versions=["9.0"])),
+                set(["9.0v8"]),
+            )
+
     @contextlib.contextmanager
     def _mock_folder_listing(self):
         """
@@ -445,6 +509,52 @@ class TestStartup(TankTestBase):
             self._get_hiero_environment(is_classic=True),
         )
 
+    def test_launch_environment_template(self):
+        """
+        Ensures plugin paths are only resolved once per launcher and that only
+        the arguments change between launches.
+        """
+        nuke_launcher = sgtk.platform.create_engine_launcher(
+            self.tk, sgtk.context.create_empty(self.tk), "tk-nuke"
+        )
+
+        with mock.patch.object(
+            nuke_launcher,
+            "_get_plugin_startup_paths",
+            wraps=nuke_launcher._get_plugin_startup_paths,
+        ) as paths_mock:
+            first_launch = nuke_launcher.prepare_launch("Nuke.exe", "", "/file/to/open")
+            second_launch = nuke_launcher.prepare_launch("Nuke.exe", "--nukex", None)
+
+        self.assertEqual(paths_mock.call_count, 1)
+        self.assertEqual(first_launch.args, "/file/to/open")
+        self.assertEqual(second_launch.args, "--nukex")
+        self.assertEqual(first_launch.environment, second_launch.environment)
+
+    def test_prepare_launches(self):
+        """
+        Ensures batch launch preparation matches individual launch preparation.
+        """
+        launch_requests = [
+            ("Nuke.exe", "", "/file/to/open"),
+            ("Nuke.exe", "--nukex", "/other/file/to/open"),
+            ("Nuke.exe", "--studio", None),
+        ]
+
+        for engine_instance, _ in self._get_engine_configurations():
+            nuke_launcher = sgtk.platform.create_engine_launcher(
+                self.tk, sgtk.context.create_empty(self.tk), engine_instance
+            )
+
+            launches = nuke_launcher.prepare_launches(launch_requests)
+            self.assertEqual(len(launches), len(launch_requests))
+
+            for launch_info, launch_request in zip(launches, launch_requests):
+                expected = nuke_launcher.prepare_launch(*launch_request)
+                self.assertEqual(launch_info.path, expected.path)
+                self.assertEqual(launch_info.args, expected.args)
+                self.assertEqual(launch_info.environment, expected.environment)
+
     def _test_launch_information(
         self, engine_name, dcc_path, args, file_to_open, expected_env
     ):
@@ -531,3 +641,67 @@ class TestStartup(TankTestBase):
                 self.assertSetEqual(set(expected_arguments), set(version.args))
                 # Ensure there are as many tokens.
                 self.assertEqual(len(expected_arguments), len(version.args))
+
+    def test_scan_cache(self):
+        """
+        Ensures scan results are reused until an install folder changes.
+        """
+        root = tempfile.mkdtemp(dir=self.tank_temp)
+        template = create_fake_installs(root, ["10.0v5", "9.0v8"])
+
+        nuke_launcher = sgtk.platform.create_engine_launcher(
+            self.tk, sgtk.context.create_empty(self.tk), "tk-nuke"
+        )
+
+        # Keep the cache outside of the install root, as writing it would
+        # otherwise invalidate it.
+        cache_path = os.path.join(self.tank_temp, "scan_cache.json")
+
+        with mock.patch.object(
+            nuke_launcher, "_get_executable_templates", return_value=[template]
+        ), mock.patch.object(
+            nuke_launcher, "_get_scan_cache_path", return_value=cache_path
+        ), mock.patch.object(
+            nuke_launcher, "_match_executables", wraps=nuke_launcher._match_executables
+        ) as glob_mock:
+            first_scan = nuke_launcher.scan_software()
+            self.assertEqual(glob_mock.call_count, 1)
+
+            # Nothing changed on disk, so the cached results should be used.
+            second_scan = nuke_launcher.scan_software()
+            self.assertEqual(glob_mock.call_count, 1)
+            self.assertEqual(
+                [(sw.display_name, sw.path) for sw in first_scan],
+                [(sw.display_name, sw.path) for sw in second_scan],
+            )
+
+            # Installing a new version touches the root folder, which should
+            # trigger a new scan.
+            create_fake_installs(root, ["11.0v1"])
+            mtime = os.stat(root).st_mtime + 10
+            os.utime(root, (mtime, mtime))
+            third_scan = nuke_launcher.scan_software()
+            self.assertEqual(glob_mock.call_count, 2)
+            self.assertIn("11.0v1", set(sw.version for sw in third_scan))
+
+            # An install still in progress has a folder but no executable yet.
+            incomplete_root = tempfile.mkdtemp(dir=self.tank_temp)
+            create_fake_installs(incomplete_root, ["12.0v1"])
+            install_folder = os.path.join(root, "Nuke12.0v1")
+            os.makedirs(install_folder)
+            mtime += 10
+            os.utime(root, (mtime, mtime))
+            fourth_scan = nuke_launcher.scan_software()
+            self.assertEqual(glob_mock.call_count, 3)
+            self.assertNotIn("12.0v1", set(sw.version for sw in fourth_scan))
+
+            # Completing the install only touches the version folder, which
+            # should also trigger a new scan.
+            for name in os.listdir(os.path.join(incomplete_root, "Nuke12.0v1")):
+                shutil.move(
+                    os.path.join(incomplete_root, "Nuke12.0v1", name), install_folder
+                )
+            os.utime(install_folder, (mtime, mtime))
+            fifth_scan = nuke_launcher.scan_software()
+            self.assertEqual(glob_mock.call_count, 4)
+            self.assertIn("12.0v1", set(sw.version for sw in fifth_scan))
@@ -0,0 +1,243 @@
+# Copyright (c) 2017 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from __future__ import with_statement
+from __future__ import print_function
+import os
+import json
+import time
+import tempfile
+import unittest
+
+from tank_test.tank_test_base import TankTestBase
+from tank_test.tank_test_base import setUpModule  # noqa
+
+import sgtk
+
+import mock
+
+from fake_installs import LAYOUT_TEMPLATES, create_fake_installs
+
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+print("tk-nuke repository root found at %s." % repo_root)
+
+
+@unittest.skipUnless(
+    os.environ.get("TK_NUKE_BENCHMARK_OUTPUT"),
+    "Set TK_NUKE_BENCHMARK_OUTPUT to a folder to run the benchmarks.",
+)
+class TestStartupBenchmark(TankTestBase):
+    """
+    Benchmarks the launcher against synthetic install trees.
+
+    The benchmarks create thousands of folders, so they only run when the
+    ``TK_NUKE_BENCHMARK_OUTPUT`` environment variable names the folder their
+    results should be written to.
+    """
+
+    # Number of fake Nuke installs used for the template matching benchmark.
+    MATCHING_INSTALL_COUNT = 5000
+
+    # Number of fake Nuke installs created for each OS layout.
+    LAYOUT_INSTALL_COUNT = 300
+
+    # Products installed in each fake macOS install.
+    PRODUCTS = ("Nuke", "NukeX", "NukeStudio")
+
+    def setUp(self):
+        """
+        Prepares the environment for unit tests.
+        """
+        super(TestStartupBenchmark, self).setUp()
+
+        # Add an environment variable that will allow the Toolkit environment to pick up the
+        # engine's code.
+        patch = mock.patch.dict("os.environ", {"TK_NUKE_REPO_ROOT": repo_root})
+        self.addCleanup(patch.stop)
+        patch.start()
+
+        # Setup the fixture. This will take the configuration at fixtures/config inside this
+        # repo.
+        self.setup_fixtures()
+
+        self._nuke_launcher = sgtk.platform.create_engine_launcher(
+            self.tk, sgtk.context.create_empty(self.tk), "tk-nuke"
+        )
+
+    def _get_fake_versions(self, count):
+        """
+        Generates unique Nuke version strings.
+
+        :param int count: Number of versions to generate.
+
+        :returns: List of versions in the format <Major>.<Minor>v<Patch>
+        """
+        versions = []
+        for index in range(count):
+            major, remainder = divmod(index, 1000)
+            minor, patch = divmod(remainder, 100)
+            versions.append("%d.%dv%d" % (major + 7, minor, patch + 1))
+        return versions
+
+    def _time(self, func, *args):
+        """
+        Times a function call.
+
+        :returns: Tuple of the elapsed time in seconds and the function's result.
+        """
+        before = time.time()
+        result = func(*args)
+        return time.time() - before, result
+
+    def _write_results(self, name, results):
+        """
+        Writes benchmark results as JSON so they can be compared between runs.
+
+        Results are written to the folder in the ``TK_NUKE_BENCHMARK_OUTPUT``
+        environment variable.
+
+        :param str name: Name of the benchmark.
+        :param dict results: Results to write.
+        """
+        output_folder = os.environ["TK_NUKE_BENCHMARK_OUTPUT"]
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+
+        output_path = os.path.join(output_folder, "tk-nuke-%s.json" % name)
+        with open(output_path, "w") as fh:
+            json.dump(results, fh, indent=4, sort_keys=True)
+        print("Benchmark results written to %s" % output_path)
+
+    def test_template_matching(self):
+        """
+        Compares the precompiled template matcher to the generic glob and match
+        implementation from the base launcher.
+        """
+        root = tempfile.mkdtemp(dir=self.tank_temp)
+        template = create_fake_installs(
+            root,
+            self._get_fake_versions(self.MATCHING_INSTALL_COUNT),
+            products=self.PRODUCTS,
+        )
+
+        generic_time, generic_matches = self._time(
+            sgtk.platform.SoftwareLauncher._glob_and_match,
+            self._nuke_launcher,
+            template,
+            self._nuke_launcher.COMPONENT_REGEX_LOOKUP,
+        )
+        compiled_time, compiled_matches = self._time(
+            self._nuke_launcher._match_executables, template
+        )
+
+        self.assertEqual(
+            sorted(path for path, _ in generic_matches),
+            sorted(path for path, _ in compiled_matches),
+        )
+        print(
+            "Matched %d executables: generic %.3fs, precompiled %.3fs"
+            % (len(compiled_matches), generic_time, compiled_time)
+        )
+        self._write_results(
+            "template-matching",
+            {
+                "executables": len(compiled_matches),
+                "generic_seconds": generic_time,
+                "precompiled_seconds": compiled_time,
+            },
+        )
+
+    def test_launcher_latency(self):
+        """
+        Times software scanning, product extraction and launch preparation for
+        each OS layout.
+        """
+        versions = self._get_fake_versions(self.LAYOUT_INSTALL_COUNT)
+        results = {}
+
+        for layout in sorted(LAYOUT_TEMPLATES):
+            root = tempfile.mkdtemp(dir=self.tank_temp)
+            template = create_fake_installs(
+                root, versions, layout, products=self.PRODUCTS
+            )
+            # Keep the cache outside of the install root, as writing it would
+            # otherwise invalidate it.
+            cache_path = os.path.join(self.tank_temp, "software_scan_%s.json" % layout)
+
+            # Pretend to be on the OS the layout belongs to.
+            with mock.patch.object(
+                sgtk.util, "is_macos", return_value=layout == "darwin"
+            ), mock.patch.object(
+                sgtk.util, "is_windows", return_value=layout == "win32"
+            ), mock.patch.object(
+                sgtk.util, "is_linux", return_value=layout == "linux2"
+            ), mock.patch.object(
+                self._nuke_launcher,
+                "_get_executable_templates",
+                return_value=[template],
+            ), mock.patch.object(
+                self._nuke_launcher, "_get_scan_cache_path", return_value=cache_path
+            ):
+                cold_scan_time, software = self._time(self._nuke_launcher.scan_software)
+                warm_scan_time, warm_software = self._time(
+                    self._nuke_launcher.scan_software
+                )
+                self.assertEqual(
+                    [sw.path for sw in software], [sw.path for sw in warm_software]
+                )
+
+                matches = self._nuke_launcher._match_executables(template)
+                extract_time, products = self._time(
+                    lambda: [
+                        sw
+                        for path, match in matches
+                        for sw in self._nuke_launcher._extract_products_from_path(
+                            path, match
+                        )
+                    ]
+                )
+
+                launch_time, launches = self._time(
+                    lambda: [
+                        self._nuke_launcher.prepare_launch(sw.path, sw.args)
+                        for sw in software
+                    ]
+                )
+
+            self.assertTrue(software)
+            self.assertEqual(len(launches), len(software))
+
+            results[layout] = {
+                "installs": len(versions),
+                "executables": len(matches),
+                "software": len(software),
+                "products": len(products),
+                "scan_software_cold_seconds": cold_scan_time,
+                "scan_software_warm_seconds": warm_scan_time,
+                "extract_products_seconds": extract_time,
+                "prepare_launch_seconds": launch_time,
+            }
+            print(
+                "%s: scanned %d installs in %.3fs (%.3fs cached), extracted %d "
+                "products in %.3fs, prepared %d launches in %.3fs"
+                % (
+                    layout,
+                    len(versions),
+                    cold_scan_time,
+                    warm_scan_time,
+                    len(products),
+                    extract_time,
+                    len(launches),
+                    launch_time,
+                )
+            )
+
+        self._write_results("launcher-latency", results)